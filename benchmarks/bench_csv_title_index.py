@@ -0,0 +1,91 @@
+"""
+bench_csv_title_index.py -- Title lookup cost in StorageCsv (dev-only)
+
+Times the real StorageCsv on generated catalogs: the one-off index build
+(first read of the file), the duplicate check of add_movie on an existing
+title (a pure index lookup, no write) and update_movie (lookup + rewrite).
+The old linear `_find_index_by_title` scan is timed on the same rows as the
+reference the index replaced.
+
+Run from the repo root:
+    python -m benchmarks.bench_csv_title_index
+"""
+
+import csv
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from storage.atomic_write import DURABILITY_NONE
+from storage.storage_csv import StorageCsv
+
+SIZES = (10_000, 100_000, 1_000_000)
+LOOKUPS = 50
+
+
+def linear_find(rows: List[Dict[str, str]], title: str) -> Optional[int]:
+    """The pre-index lookup, kept here as the baseline."""
+    target = title.casefold()
+    for i, row in enumerate(rows):
+        if (row.get("title") or "").casefold() == target:
+            return i
+    return None
+
+
+def write_catalog(path: str, n: int) -> List[Dict[str, str]]:
+    rows = [
+        {"title": f"Movie Title {i}", "rating": "7.0", "year": "1999", "poster": ""}
+        for i in range(n)
+    ]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=StorageCsv.FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def main() -> None:
+    print(
+        f"{'rows':>10} | {'linear / lookup':>16} | {'index build':>11} | "
+        f"{'index / lookup':>15} | {'update_movie':>12}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            path = os.path.join(tmp, f"movies_{n}.csv")
+            rows = write_catalog(path, n)
+            # Existing titles spread over the file; the scan stops at each one.
+            queries = [f"movie title {i * n // LOOKUPS}" for i in range(LOOKUPS)]
+
+            start = time.perf_counter()
+            for q in queries:
+                linear_find(rows, q)
+            linear = (time.perf_counter() - start) / LOOKUPS
+
+            storage = StorageCsv(path, durability=DURABILITY_NONE)
+            start = time.perf_counter()
+            storage.version()  # first read builds the title index
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for q in queries:
+                try:
+                    storage.add_movie(q, "1999", 7.0, None)
+                except ValueError:
+                    pass
+                else:
+                    raise AssertionError(f"{q!r} should already exist")
+            indexed = (time.perf_counter() - start) / LOOKUPS
+
+            start = time.perf_counter()
+            storage.update_movie(queries[-1], 8.0)
+            update = time.perf_counter() - start
+
+            print(
+                f"{n:>10,} | {linear * 1e3:>13.3f} ms | {build * 1e3:>8.1f} ms | "
+                f"{indexed * 1e6:>12.3f} µs | {update * 1e3:>9.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+bench_fuzzy_prefilter.py -- Fuzzy search: trigram pre-filter vs brute force (dev-only)
+
+Scores typo'd queries against a large synthetic catalog with FuzzyEngine,
+once over every title and once over the `max_candidates` titles that share
+the most trigrams with the query, and reports latency plus recall@10 (the
+share of the brute-force top 10 the pre-filtered search also returns).
+
+Run from the repo root:
+    python -m benchmarks.bench_fuzzy_prefilter
+"""
+
+import random
+import time
+
+from benchmarks.bench_substring_search import make_titles
+from fuzzy_engine import FuzzyEngine
+
+N = 500_000
+QUERIES = 20
+K = 10
+CANDIDATES = (500, 2_000, 5_000, 20_000)
+
+
+def typo(text: str, rng: random.Random) -> str:
+    """Drop the numeric suffix and apply one or two character edits."""
+    chars = list(text.rsplit(" ", 1)[0])
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(chars))
+        edit = rng.choice(("drop", "swap", "replace"))
+        if edit == "drop" and len(chars) > 3:
+            del chars[i]
+        elif edit == "swap" and i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        else:
+            chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def main() -> None:
+    rng = random.Random(7)
+    titles = make_titles(N)
+    queries = [typo(rng.choice(titles), rng) for _ in range(QUERIES)]
+
+    brute = FuzzyEngine(titles, prefilter_min=N + 1)
+    start = time.perf_counter()
+    engine = FuzzyEngine(titles, prefilter_min=0)
+    print(f"{N:,} titles, {QUERIES} typo'd queries; pre-filter build {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    expected = [brute.matches(q, limit=K) for q in queries]
+    brute_ms = (time.perf_counter() - start) * 1000 / QUERIES
+    print(f"{'max_candidates':>15}{'ms/query':>10}{'recall@10':>11}")
+    print(f"{'all (brute)':>15}{brute_ms:>10.1f}{1.0:>11.3f}")
+
+    for max_candidates in CANDIDATES:
+        engine.max_candidates = max_candidates
+        start = time.perf_counter()
+        found = [engine.matches(q, limit=K) for q in queries]
+        ms = (time.perf_counter() - start) * 1000 / QUERIES
+        hits = total = 0
+        for want, got in zip(expected, found):
+            want_titles = {title for title, _ in want}
+            hits += len(want_titles & {title for title, _ in got})
+            total += len(want_titles)
+        print(f"{max_candidates:>15,}{ms:>10.1f}{hits / max(total, 1):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
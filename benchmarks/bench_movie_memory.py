@@ -0,0 +1,55 @@
+"""
+bench_movie_memory.py -- Memory per stored record: dict-of-dicts vs Movie (dev-only)
+
+Measures the heap cost (tracemalloc) of the in-memory catalog, i.e. the outer
+title dict plus one record per movie. Title and field strings are shared
+between both layouts so only the record containers are compared.
+
+Run from the repo root:
+    python -m benchmarks.bench_movie_memory
+"""
+
+import tracemalloc
+
+from storage.movie import Movie
+
+N = 200_000
+
+
+def measure(build) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    catalog = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(catalog) == N
+    return (after - before) / N
+
+
+def main() -> None:
+    titles = [f"Movie Title {i}" for i in range(N)]
+    years = [str(1900 + i % 125) for i in range(N)]
+    ratings = [float(i % 100) / 10 for i in range(N)]
+    posters = [f"https://example.org/{i}.jpg" for i in range(N)]
+
+    def dict_records():
+        return {
+            t: {"year": y, "rating": r, "poster": p}
+            for t, y, r, p in zip(titles, years, ratings, posters)
+        }
+
+    def movie_records():
+        return {
+            t: Movie(t, y, r, p)
+            for t, y, r, p in zip(titles, years, ratings, posters)
+        }
+
+    old = measure(dict_records)
+    new = measure(movie_records)
+    print(f"{N:,} records")
+    print(f"dict-of-dicts : {old:6.1f} bytes/record")
+    print(f"Movie slots   : {new:6.1f} bytes/record  ({(1 - new / old) * 100:.0f}% less)")
+
+
+if __name__ == "__main__":
+    main()
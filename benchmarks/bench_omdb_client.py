@@ -0,0 +1,53 @@
+"""
+bench_omdb_client.py -- OMDb client throughput against the local stub server (dev-only)
+
+Starts src.omdb_stub_server in-process with injected latency and errors and
+compares sequential lookups with fetch_many. No API key or network needed;
+the cache and quota ledger are disabled so every lookup is a request.
+
+Run from the repo root:
+    python -m benchmarks.bench_omdb_client
+"""
+
+import time
+
+from src.omdb_bulk import fetch_many
+from src.omdb_client import OmdbClient, OmdbError
+from src.omdb_resilience import RetryPolicy
+from src.omdb_stub_server import OmdbStubServer, parse_latency, synthetic_catalog
+
+N = 400
+LATENCY = "exp:20"
+ERROR_RATE = 0.02
+
+
+def main() -> None:
+    titles = [f"Movie {i}" for i in range(N)]
+    stub = OmdbStubServer(synthetic_catalog(N), latency=parse_latency(LATENCY), error_rate=ERROR_RATE)
+    retry = RetryPolicy(base_delay=0.01, max_delay=0.05)
+    print(f"{N} lookups, latency {LATENCY} ms, {ERROR_RATE:.0%} HTTP 503")
+    with stub:
+        with OmdbClient("bench", base_url=stub.base_url, cache=None, retry=retry, breaker=None, quota=None) as client:
+            start = time.perf_counter()
+            failed = 0
+            for title in titles:
+                try:
+                    client.fetch_by_title(title)
+                except OmdbError:
+                    failed += 1
+            elapsed = time.perf_counter() - start
+            print(f"sequential       : {N / elapsed:7.1f} req/s  ({failed} failed)")
+
+        for workers in (8, 32):
+            with OmdbClient("bench", base_url=stub.base_url, cache=None, retry=retry, breaker=None, quota=None,
+                            pool_size=workers) as client:
+                start = time.perf_counter()
+                results = list(fetch_many(titles, client=client, max_workers=workers, rate=10_000))
+                elapsed = time.perf_counter() - start
+                failed = sum(r.error is not None for r in results)
+                print(f"fetch_many x{workers:<3} : {N / elapsed:7.1f} req/s  ({failed} failed)")
+    print(f"stub served {stub.requests_served} requests (including retries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+bench_substring_search.py -- Substring title search: linear scan vs trigram index (dev-only)
+
+Compares utils.substring_matches (normalizes and scans every title per
+query) with TitleIndex.substring (trigram postings, verified candidates)
+on a synthetic catalog, and checks both return the same titles.
+
+Run from the repo root:
+    python -m benchmarks.bench_substring_search
+"""
+
+import itertools
+import random
+import string
+import time
+
+from title_index import TitleIndex
+from utils import substring_matches
+
+N = 1_000_000
+COMMON = ["the", "of", "a", "and", "love", "night", "man", "last", "dark", "star", "war", "city", "return"]
+QUERIES = ["godfather", "star war", "the", "night of", "xyzzy", "return of the"]
+
+
+def make_titles(count: int) -> list:
+    rng = random.Random(42)
+    vocab = COMMON + [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(20_000)
+    ]
+    weights = [50] * len(COMMON) + [1] * (len(vocab) - len(COMMON))
+    cum_weights = list(itertools.accumulate(weights))
+    titles = [
+        " ".join(rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(1, 5))).title() + f" {i}"
+        for i in range(count)
+    ]
+    titles[count // 2] = "The Godfather"
+    return titles
+
+
+def timed(fn, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main() -> None:
+    titles = make_titles(N)
+    index, build_ms = timed(lambda: TitleIndex(titles), repeat=1)
+    _, trigram_ms = timed(lambda: index.substring("warm up"), repeat=1)
+    print(f"{N:,} titles | TitleIndex build {build_ms:,.0f} ms + trigram postings {trigram_ms:,.0f} ms")
+    print(f"{'query':<16}{'matches':>9}{'scan ms':>11}{'index ms':>11}")
+    for query in QUERIES:
+        expected, scan_ms = timed(lambda: substring_matches(titles, query), repeat=1)
+        found, index_ms = timed(lambda: index.substring(query))
+        assert found == expected, query
+        print(f"{query!r:<16}{len(found):>9,}{scan_ms:>11.1f}{index_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+bulk_import.py
+Import a list of titles into a catalog: concurrent OMDb fetch -> validation
+-> batched writes, connected by bounded queues.
+
+Usage:
+    python bulk_import.py titles.txt --storage storage/movies.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from istorage import IStorage, ADDED
+from src.omdb_bulk import DEFAULT_RATE, DEFAULT_WORKERS, fetch_many
+from src.omdb_client import (
+    OmdbAuthError,
+    OmdbClient,
+    OmdbNotFound,
+    OmdbRateLimit,
+    extract_core_fields,
+    get_default_client,
+)
+from storage.factory import open_storage
+from utils import normalize_title
+from validators import safe_float
+
+_DONE = object()  # end-of-stream marker passed down the queues
+_POLL_INTERVAL = 0.1  # seconds a queue put/get waits before re-checking for an abort
+
+
+def read_titles(path: str | Path) -> Iterator[str]:
+    """
+    Yield titles from a text file (one per line, '#' comments allowed) or a
+    CSV file (the "title" column if there is one, else the first column).
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            rows = csv.reader(f)
+            header = next(rows, None)
+            if header is None:
+                return
+            lowered = [h.strip().lower() for h in header]
+            column = lowered.index("title") if "title" in lowered else 0
+            if "title" not in lowered and header[0].strip():
+                yield header[0].strip()  # no header row: the first line is data
+            for row in rows:
+                if len(row) > column and row[column].strip():
+                    yield row[column].strip()
+        else:
+            for line in f:
+                title = line.strip()
+                if title and not title.startswith("#"):
+                    yield title
+
+
+class Checkpoint:
+    """
+    Append-only record of titles that are finished (added, duplicate or not
+    found on OMDb), so an interrupted import resumes where it stopped.
+    Titles that failed for transient reasons are not recorded.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.done: Set[str] = set()
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                self.done.update(line.rstrip("\n") for line in f if line.strip())
+
+    def __contains__(self, title: str) -> bool:
+        return normalize_title(title) in self.done
+
+    def mark(self, titles: List[str]) -> None:
+        keys = [normalize_title(t) for t in titles]
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key in keys)
+        self.done.update(keys)
+
+
+def run_bulk_import(
+    storage: IStorage,
+    titles_path: str | Path,
+    *,
+    checkpoint_path: Optional[str | Path] = None,
+    batch_size: int = 100,
+    max_workers: int = DEFAULT_WORKERS,
+    rate: float = DEFAULT_RATE,
+    queue_size: int = 256,
+    client: Optional[OmdbClient] = None,
+    show_progress: bool = True,
+) -> Dict[str, int]:
+    """
+    Import every title in `titles_path` into `storage`.
+
+    Stages (each bounded queue applies backpressure to the stage before it):
+        fetch    -- src.omdb_bulk.fetch_many, concurrent and rate limited
+        validate -- extract_core_fields + safe_float -> add_many rows
+        write    -- add_many per batch inside storage.transaction(), then
+                    the batch is recorded in the checkpoint
+
+    The import stops early on OmdbAuthError or OmdbRateLimit (re-running
+    with the same checkpoint picks up the rest).
+
+    Returns:
+        Counts per outcome: added, duplicate, not_found, failed, skipped.
+    """
+    checkpoint = Checkpoint(checkpoint_path or f"{titles_path}.checkpoint")
+    counts = {"added": 0, "duplicate": 0, "not_found": 0, "failed": 0, "skipped": 0}
+    total = sum(1 for _ in read_titles(titles_path))
+    if client is None:
+        client = get_default_client()
+    try:
+        remaining = client.remaining_quota()
+    except OmdbAuthError:
+        remaining = None  # reported by the first lookup
+    if show_progress and remaining is not None and remaining < total:
+        print(
+            f"Note: {remaining} OMDb requests left today for up to {total} titles;"
+            " the import stops when the quota runs out (re-run after the reset to resume).",
+            file=sys.stderr,
+        )
+
+    def pending_titles() -> Iterator[str]:
+        for title in read_titles(titles_path):
+            if title in checkpoint:
+                counts["skipped"] += 1
+            else:
+                yield title
+
+    fetched: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    validated: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()  # no more fetching (auth error / quota); drain what's in flight
+    abort = threading.Event()  # a stage failed: every stage bails out at once
+    stop_reason: List[str] = []
+    stage_errors: List[BaseException] = []
+
+    def put(q: "queue.Queue", item) -> bool:
+        """Blocking put that gives up (False) once the pipeline is aborted."""
+        while not abort.is_set():
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(q: "queue.Queue"):
+        """Blocking get that returns _DONE once the pipeline is aborted."""
+        while not abort.is_set():
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def stage(fn):
+        def run() -> None:
+            try:
+                fn()
+            except BaseException as exc:
+                stage_errors.append(exc)
+                abort.set()
+        return run
+
+    def fetch_stage() -> None:
+        results = fetch_many(pending_titles(), client=client, max_workers=max_workers, rate=rate)
+        try:
+            for result in results:
+                if stop.is_set() or not put(fetched, result):
+                    break
+        finally:
+            results.close()
+            put(fetched, _DONE)
+
+    def validate_stage() -> None:
+        while (result := get(fetched)) is not _DONE:
+            if result.error is not None:
+                if isinstance(result.error, (OmdbAuthError, OmdbRateLimit)) and not stop.is_set():
+                    stop_reason.append(str(result.error))
+                    stop.set()
+                item = (result.title, None, result.error)
+            else:
+                core = extract_core_fields(result.payload)
+                if not core["Title"]:
+                    item = (result.title, None, ValueError("OMDb payload has no title"))
+                else:
+                    rating = safe_float(core["Rating"]) if core["Rating"] is not None else None
+                    item = (result.title, (core["Title"], core["Year"], rating, core["Poster"]), None)
+            if not put(validated, item):
+                return
+        put(validated, _DONE)
+
+    workers = [
+        threading.Thread(target=stage(fetch_stage), name="bulk-fetch", daemon=True),
+        threading.Thread(target=stage(validate_stage), name="bulk-validate", daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+
+    def write_batch(batch: list) -> None:
+        rows = [row for _, row, _ in batch if row is not None]
+        if rows:
+            with storage.transaction():
+                results = storage.add_many(rows)
+            for _, status in results:
+                counts["added" if status == ADDED else "duplicate"] += 1
+        finished = []
+        for input_title, row, error in batch:
+            if row is not None or isinstance(error, OmdbNotFound):
+                finished.append(input_title)
+            if isinstance(error, OmdbNotFound):
+                counts["not_found"] += 1
+            elif error is not None:
+                counts["failed"] += 1
+        if finished:
+            checkpoint.mark(finished)
+        if show_progress:
+            processed = sum(counts.values())
+            print(
+                f"\rImported {processed}/{total} | added {counts['added']}"
+                f" | duplicate {counts['duplicate']} | not found {counts['not_found']}"
+                f" | failed {counts['failed']} | skipped {counts['skipped']}",
+                end="", file=sys.stderr, flush=True,
+            )
+
+    batch: list = []
+    try:
+        while (item := get(validated)) is not _DONE:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                write_batch(batch)
+                batch = []
+        if stage_errors:
+            raise stage_errors[0]
+        if batch:
+            write_batch(batch)
+    except BaseException:
+        # Unblock the fetch/validate threads (they may be waiting on full queues).
+        abort.set()
+        raise
+    finally:
+        for worker in workers:
+            worker.join()
+        if show_progress:
+            print(file=sys.stderr)
+        if stop_reason:
+            print(f"Import stopped early: {stop_reason[0]} Re-run to resume.", file=sys.stderr)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import movie titles via OMDb.")
+    parser.add_argument("titles", help="text file (one title per line) or CSV with a 'title' column")
+    parser.add_argument("--storage", default="storage/movies.csv", help="catalog file (.csv, .json, .sqlite3)")
+    parser.add_argument("--checkpoint", help="resume file (default: <titles>.checkpoint)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="max OMDb requests per second")
+    args = parser.parse_args(argv)
+
+    counts = run_bulk_import(
+        open_storage(args.storage),
+        args.titles,
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        rate=args.rate,
+    )
+    print(", ".join(f"{name}: {count}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
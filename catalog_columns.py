@@ -0,0 +1,98 @@
+"""
+catalog_columns.py -- columnar (NumPy) view of the catalog for analytics commands
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from storage.movie import year_start_of
+
+# int32 sentinel for "no parseable year"
+YEAR_MISSING = np.iinfo(np.int32).min
+
+
+class MovieColumns:
+    """
+    The catalog as parallel arrays, built in one pass over the storage:
+
+        titles:     list[str]
+        records:    list of the original records (for display)
+        ratings:    float64 array, NaN where the rating is missing
+        year_start: int32 array, YEAR_MISSING where the year is unparseable
+
+    Stats, sorting and filtering then run as vectorized masks / argsort
+    instead of per-row Python loops.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, Mapping[str, Any]]]) -> None:
+        titles: List[str] = []
+        records: List[Mapping[str, Any]] = []
+        ratings: List[float] = []
+        years: List[int] = []
+        for title, record in items:
+            titles.append(title)
+            records.append(record)
+            rating = record.get("rating")
+            ratings.append(rating if isinstance(rating, (int, float)) else np.nan)
+            # Movie records carry the parsed year already
+            year = getattr(record, "year_start", None)
+            if year is None:
+                year = year_start_of(record.get("year"))
+            years.append(YEAR_MISSING if year is None else year)
+
+        self.titles = titles
+        self.records = records
+        self.ratings = np.array(ratings, dtype=np.float64)
+        self.year_start = np.array(years, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def stats(self) -> Optional[Tuple[float, float, str, str]]:
+        """
+        (average, median, best title, worst title) over rated movies,
+        or None if nothing is rated.
+        """
+        rated = ~np.isnan(self.ratings)
+        if not rated.any():
+            return None
+        return (
+            float(np.nanmean(self.ratings)),
+            float(np.nanmedian(self.ratings)),
+            self.titles[int(np.nanargmax(self.ratings))],
+            self.titles[int(np.nanargmin(self.ratings))],
+        )
+
+    def order_by_rating(self) -> np.ndarray:
+        """Row indices, highest rating first; unrated last, ties in catalog order."""
+        keys = np.where(np.isnan(self.ratings), -np.inf, self.ratings)
+        return np.argsort(-keys, kind="stable")
+
+    def order_by_year(self, latest_first: bool = False) -> np.ndarray:
+        """
+        Row indices by start year. Unknown years sort after known ones in
+        both directions; ties keep catalog order.
+        """
+        missing = (self.year_start == YEAR_MISSING).astype(np.int8)
+        years = np.where(missing, 0, self.year_start).astype(np.int64)
+        return np.lexsort((-years if latest_first else years, missing))
+
+    def filter(
+        self,
+        min_rating: Optional[float] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+    ) -> np.ndarray:
+        """Row indices (catalog order) matching every given bound; unrated/undated rows fail a bound."""
+        mask = np.ones(len(self), dtype=bool)
+        if min_rating is not None:
+            mask &= self.ratings >= min_rating  # NaN compares False
+        known_year = self.year_start != YEAR_MISSING
+        if start_year is not None:
+            mask &= known_year & (self.year_start >= start_year)
+        if end_year is not None:
+            mask &= known_year & (self.year_start <= end_year)
+        return np.flatnonzero(mask)
@@ -0,0 +1 @@
+"""Lets `pytest` (not only `python -m pytest`) import the top-level modules from the repo root."""
@@ -0,0 +1,95 @@
+"""
+fuzzy_engine.py -- batched fuzzy title matching on RapidFuzz's C++ batch APIs
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+from trigram_index import TrigramIndex
+from utils import FUZZY_LIMIT, FUZZY_THRESHOLD
+
+# From this many titles on, score on all cores (workers=-1).
+PARALLEL_MIN_TITLES = 20_000
+# From this many titles on, only the titles sharing the most trigrams with
+# the query are scored. More candidates: better recall, slower queries.
+PREFILTER_MIN_TITLES = 200_000
+DEFAULT_MAX_CANDIDATES = 5_000
+
+
+class FuzzyEngine:
+    """
+    WRatio matching of a query against a fixed list of titles.
+
+    Titles are pre-processed once (rapidfuzz default_process: lower-cased,
+    punctuation stripped), so a query costs one process.cdist call with
+    score_cutoff (on all cores from PARALLEL_MIN_TITLES titles on); the top
+    k are then picked with np.partition and only those (plus ties) sorted.
+
+    On very large catalogs (`prefilter_min` titles and up) a trigram index
+    over the processed titles first narrows the field to the
+    `max_candidates` titles sharing the most trigrams with the query; only
+    those are scored. This trades a little recall for latency: titles that
+    WRatio would rank highly but that share few trigrams with the query
+    (e.g. a typo in every 3-letter window) can be missed. Queries under 3
+    characters always score every title.
+
+    Build one per catalog version (TitleIndex does) and reuse it.
+    """
+
+    def __init__(
+        self,
+        titles: Iterable[str],
+        *,
+        max_candidates: int = DEFAULT_MAX_CANDIDATES,
+        prefilter_min: int = PREFILTER_MIN_TITLES,
+    ) -> None:
+        self.titles: List[str] = list(titles)
+        self._choices: List[str] = [default_process(title) for title in self.titles]
+        self.max_candidates = max_candidates
+        self._prefilter: Optional[TrigramIndex] = None
+        if len(self.titles) >= prefilter_min:
+            self._prefilter = TrigramIndex(zip(self.titles, self._choices))
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def matches(
+        self,
+        query: str,
+        threshold: float = FUZZY_THRESHOLD,
+        limit: Optional[int] = FUZZY_LIMIT,
+    ) -> List[Tuple[str, float]]:
+        """
+        Up to `limit` (title, score) pairs scoring at least `threshold`,
+        best first; ties by title. `limit=None` returns every match.
+        """
+        processed = default_process(query)
+        if not processed or not self.titles:
+            return []
+
+        titles, choices = self.titles, self._choices
+        if self._prefilter is not None and len(processed) >= 3:
+            candidates = self._prefilter.most_shared(processed, self.max_candidates)
+            titles = [self.titles[i] for i in candidates]
+            choices = [self._choices[i] for i in candidates]
+
+        scores = process.cdist(
+            [processed], choices, scorer=fuzz.WRatio, processor=None, score_cutoff=threshold,
+            workers=1 if len(choices) < PARALLEL_MIN_TITLES else -1,
+            dtype=np.float64,  # float32 would merge near-equal scores into false ties
+        )[0]
+        indices = np.flatnonzero(scores >= threshold)
+        if limit is not None and len(indices) > limit:
+            # Keep everything tied with the k-th best so the title
+            # tie-break below stays exact.
+            kth = np.partition(scores[indices], -limit)[-limit]
+            indices = indices[scores[indices] >= kth]
+        scored = [(titles[i], float(scores[i])) for i in indices.tolist()]
+
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored if limit is None else scored[:limit]
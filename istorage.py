@@ -3,18 +3,55 @@ Interface CRUD
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Hashable, Iterable, Iterator, List, Mapping, Tuple
+
+from storage.movie import Movie
+
+# Per-item outcomes reported by the batch methods.
+ADDED = "added"
+UPDATED = "updated"
+DELETED = "deleted"
+DUPLICATE = "duplicate"
+NOT_FOUND = "not found"
+
+# (title, year, rating, poster) -- same order as add_movie's arguments.
+MovieRow = Tuple[str, str | None, float | None, str | None]
 
 class IStorage(ABC):
 	""" Abstract storage interface exposing CRUD operations for movies."""
 
 	@abstractmethod
-	def list_movies(self) -> Dict[str, Dict[str, Any]]:
+	def list_movies(self) -> Mapping[str, Movie]:
 		"""
 		return ll movies keyed by title.
+		Records are Movie objects, which also read like the old
+		{"year", "rating", "poster"} dicts.
 		"""
 		raise NotImplementedError
 
+	def iter_movies(self) -> Iterator[Tuple[str, Movie]]:
+		"""
+		Stream (title, record) pairs without building the whole catalog dict.
+		Backends override this to read incrementally; the default wraps list_movies().
+		"""
+		yield from self.list_movies().items()
+
+	def version(self) -> Hashable | None:
+		"""
+		Token that changes whenever the stored catalog changes, so derived
+		structures (indexes, columnar views) can be rebuilt only when needed.
+		None means "unknown": callers must rebuild every time.
+		"""
+		return None
+
+	def location(self) -> str | None:
+		"""
+		Absolute path of the backing file, so another process (e.g. the lookup
+		queue worker) can open the same catalog. None if there is no such file.
+		"""
+		return None
+
 	@abstractmethod
 	def add_movie(self, title: str, year: str, rating: float | None, poster: str | None) -> None:
 		"""
@@ -34,4 +71,62 @@ class IStorage(ABC):
 		"""
 	    Update only the rating for an existing movie.
 	    """
-		raise NotImplementedError
\ No newline at end of file
+		raise NotImplementedError
+
+	@contextmanager
+	def transaction(self) -> Iterator["IStorage"]:
+		"""
+		Group several mutations so they land together or not at all:
+
+			with storage.transaction():
+				storage.add_movie(...)
+				storage.delete_movie(...)
+
+		Built-in backends buffer the changes and flush them once on exit, or
+		discard them if the block raises. Nested blocks join the outer one.
+		This default has no buffering: mutations are applied as they happen.
+		"""
+		yield self
+
+	# ----------------- Batch mutations -----------------
+	# Defaults loop over the single-record methods, so third-party backends get
+	# them for free. Built-in backends override them with one read + one flush.
+
+	def add_many(self, movies: Iterable[MovieRow]) -> List[Tuple[str, str]]:
+		"""
+		Add several movies. Returns (title, ADDED | DUPLICATE) per input item.
+		"""
+		results = []
+		for title, year, rating, poster in movies:
+			try:
+				self.add_movie(title, year, rating, poster)
+				results.append((title, ADDED))
+			except ValueError:
+				results.append((title, DUPLICATE))
+		return results
+
+	def update_many(self, ratings: Iterable[Tuple[str, float | None]]) -> List[Tuple[str, str]]:
+		"""
+		Update several ratings. Returns (title, UPDATED | NOT_FOUND) per input item.
+		"""
+		results = []
+		for title, rating in ratings:
+			try:
+				self.update_movie(title, rating)
+				results.append((title, UPDATED))
+			except KeyError:
+				results.append((title, NOT_FOUND))
+		return results
+
+	def delete_many(self, titles: Iterable[str]) -> List[Tuple[str, str]]:
+		"""
+		Delete several movies. Returns (title, DELETED | NOT_FOUND) per input item.
+		"""
+		results = []
+		for title in titles:
+			try:
+				self.delete_movie(title)
+				results.append((title, DELETED))
+			except KeyError:
+				results.append((title, NOT_FOUND))
+		return results
@@ -0,0 +1,380 @@
+"""
+lookup_queue.py
+Durable queue of OMDb lookups that could not run yet (rate limit reached),
+plus a worker that drains it into a catalog at the allowed rate.
+
+Titles are queued by "Add movie" when OMDb reports the rate limit, together
+with the catalog they were meant for. Drain the queue (safe to stop and
+restart at any time):
+    python lookup_queue.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from istorage import IStorage
+from src.omdb_bulk import DEFAULT_RATE, TokenBucket
+from src.omdb_cache import user_cache_dir
+from src.omdb_client import (
+    OmdbAuthError,
+    OmdbClient,
+    OmdbError,
+    OmdbNotFound,
+    OmdbRateLimit,
+    extract_core_fields,
+    get_default_client,
+)
+from storage.factory import open_storage
+from utils import normalize_title
+from validators import safe_float
+
+QUEUE_FILE_NAME = "lookup_queue.sqlite3"
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+DEFAULT_KEEP_DONE = 1_000
+
+
+class Job(NamedTuple):
+    id: int
+    title: str
+    attempts: int
+    storage: Optional[str]  # catalog file the title was queued for (None: the worker's default)
+
+
+def default_queue_path() -> Path:
+    """The queue file inside the per-user directory of the lookup cache."""
+    return user_cache_dir() / QUEUE_FILE_NAME
+
+
+def next_quota_reset(now: Optional[float] = None) -> float:
+    """Timestamp of the next UTC midnight, when OMDb daily quotas reset."""
+    current = datetime.fromtimestamp(time.time() if now is None else now, tz=timezone.utc)
+    midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp()
+
+
+class LookupQueue:
+    """
+    SQLite-backed queue of titles to look up, one row per catalog and
+    normalized title.
+
+    A job is claimed with a lease; if the worker dies mid-job the lease
+    expires and the job is picked up again, so nothing is lost across
+    restarts. Deferred jobs wait until their `not_before` time. Only the
+    `keep_done` most recently finished jobs are kept, so the table doesn't
+    grow with every title ever looked up.
+
+    Thread-safe: one connection guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        lease: float = 120.0,
+        keep_done: int = DEFAULT_KEEP_DONE,
+    ) -> None:
+        path = Path(path) if path is not None else default_queue_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease = lease
+        self.keep_done = keep_done
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+            if columns and "storage" not in columns:
+                # Queues from before jobs remembered their catalog: rebuild
+                # with the new key, old jobs fall back to the worker's default.
+                self._conn.execute("ALTER TABLE jobs RENAME TO jobs_old")
+                self._conn.execute("DROP INDEX IF EXISTS idx_jobs_due")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id          INTEGER PRIMARY KEY,
+                    storage     TEXT NOT NULL DEFAULT '',
+                    title       TEXT NOT NULL,
+                    title_key   TEXT NOT NULL,
+                    status      TEXT NOT NULL,
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    not_before  REAL NOT NULL,
+                    last_error  TEXT,
+                    created_at  REAL NOT NULL,
+                    UNIQUE (storage, title_key)
+                )
+                """
+            )
+            if columns and "storage" not in columns:
+                self._conn.execute(
+                    """
+                    INSERT INTO jobs (id, title, title_key, status, attempts, not_before, last_error, created_at)
+                    SELECT id, title, title_key, status, attempts, not_before, last_error, created_at FROM jobs_old
+                    """
+                )
+                self._conn.execute("DROP TABLE jobs_old")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (status, not_before)")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            self._conn.close()
+            raise
+
+    def enqueue(self, title: str, storage: Optional[str] = None) -> bool:
+        """
+        Queue a title for the catalog file `storage` (see IStorage.location()).
+        Returns False if it is already pending; finished or failed titles are
+        queued again.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO jobs (storage, title, title_key, status, not_before, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (storage, title_key) DO UPDATE
+                SET title = excluded.title, status = excluded.status, attempts = 0,
+                    not_before = excluded.not_before, last_error = NULL
+                WHERE status IN (?, ?)
+                """,
+                (storage or "", title, normalize_title(title), PENDING, now, now, DONE, FAILED),
+            )
+            return cursor.rowcount > 0
+
+    def claim(self) -> Optional[Job]:
+        """Lease the next due job (pending, or running with an expired lease)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    """
+                    SELECT id, title, attempts, storage FROM jobs
+                    WHERE status IN (?, ?) AND not_before <= ?
+                    ORDER BY not_before, id LIMIT 1
+                    """,
+                    (PENDING, RUNNING, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, not_before = ? WHERE id = ?",
+                        (RUNNING, now + self.lease, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return None if row is None else Job(row[0], row[1], row[2] + 1, row[3] or None)
+
+    def complete(self, job: Job) -> None:
+        self._set(job, DONE, time.time(), None)
+        with self._lock:
+            # not_before holds the finish time of DONE jobs.
+            self._conn.execute(
+                """
+                DELETE FROM jobs WHERE status = ? AND id NOT IN
+                    (SELECT id FROM jobs WHERE status = ? ORDER BY not_before DESC, id DESC LIMIT ?)
+                """,
+                (DONE, DONE, self.keep_done),
+            )
+
+    def fail(self, job: Job, error: str) -> None:
+        self._set(job, FAILED, time.time(), error)
+
+    def defer(self, job: Job, until: float, error: Optional[str] = None) -> None:
+        """Put a job back to wait until `until` (a timestamp)."""
+        self._set(job, PENDING, until, error)
+
+    def next_due(self) -> Optional[float]:
+        """When the earliest waiting job becomes due, or None if nothing is waiting."""
+        with self._lock:
+            (due,) = self._conn.execute(
+                "SELECT MIN(not_before) FROM jobs WHERE status IN (?, ?)", (PENDING, RUNNING)
+            ).fetchone()
+        return due
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _set(self, job: Job, status: str, not_before: float, error: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, not_before = ?, last_error = ? WHERE id = ?",
+                (status, not_before, error, job.id),
+            )
+
+
+class QueueWorker:
+    """
+    Drains a LookupQueue into the catalogs the titles were queued for:
+
+    - each job goes to the catalog file recorded with it, opened on first
+      use; `storage` takes the jobs queued without one;
+    - lookups are paced by a token bucket (`rate` per second);
+    - OmdbRateLimit defers the job, and the worker stops claiming jobs until
+      the quota resets (next UTC midnight); with a quota ledger it also waits
+      whenever the shared daily budget is used up, before claiming a job;
+    - other transient errors are retried with exponential backoff, up to
+      `max_attempts`; "not found" fails the job for good;
+    - OmdbAuthError stops the worker (the job stays queued).
+    """
+
+    def __init__(
+        self,
+        storage: Optional[IStorage],
+        queue: LookupQueue,
+        *,
+        client: Optional[OmdbClient] = None,
+        rate: float = DEFAULT_RATE,
+        max_attempts: int = 5,
+        retry_delay: float = 60.0,
+        poll_interval: float = 5.0,
+    ) -> None:
+        self.storage = storage
+        self.queue = queue
+        self.client = client
+        self.limiter = TokenBucket(rate)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._opened: Dict[str, IStorage] = {}
+        self._paused_until = 0.0
+
+    def run(self, *, until_empty: bool = False) -> None:
+        """Process jobs until stopped (or, with until_empty, until nothing is waiting)."""
+        client = self.client or get_default_client()
+        try:
+            self._run(client, until_empty)
+        finally:
+            self._close_opened()
+
+    def _run(self, client: OmdbClient, until_empty: bool) -> None:
+        while not self.stop_event.is_set():
+            if client.remaining_quota() == 0:
+                # Shared ledger says today's budget is gone: wait for the reset.
+                self._paused_until = max(self._paused_until, next_quota_reset())
+            if time.time() < self._paused_until:
+                # Out of quota: claiming another job would only hit the limit again.
+                self.stop_event.wait(min(self._paused_until - time.time(), 3600.0))
+                continue
+            job = self.queue.claim()
+            if job is None:
+                due = self.queue.next_due()
+                if due is None and until_empty:
+                    return
+                wait = self.poll_interval if due is None else min(max(due - time.time(), 0.0), 3600.0)
+                self.stop_event.wait(wait)
+                continue
+            self.limiter.acquire()
+            try:
+                payload = client.fetch_by_title(job.title)
+            except OmdbNotFound as exc:
+                self.queue.fail(job, str(exc))
+            except OmdbRateLimit as exc:
+                self._paused_until = next_quota_reset()
+                self.queue.defer(job, self._paused_until, str(exc))
+            except OmdbAuthError as exc:
+                self.queue.defer(job, time.time(), str(exc))
+                raise
+            except OmdbError as exc:
+                if job.attempts >= self.max_attempts:
+                    self.queue.fail(job, str(exc))
+                else:
+                    backoff = self.retry_delay * 2 ** (job.attempts - 1)
+                    self.queue.defer(job, time.time() + backoff, str(exc))
+            else:
+                self._store(job, payload)
+
+    def start(self) -> "QueueWorker":
+        """Run in a background daemon thread."""
+        self._thread = threading.Thread(target=self.run, name="lookup-queue", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self.stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _store(self, job: Job, payload: Dict[str, str]) -> None:
+        core = extract_core_fields(payload)
+        if not core["Title"]:
+            self.queue.fail(job, "OMDb payload has no title")
+            return
+        try:
+            storage = self._storage_for(job)
+        except (OSError, ValueError) as exc:
+            self.queue.fail(job, f"cannot open catalog {job.storage}: {exc}")
+            return
+        if storage is None:
+            self.queue.fail(job, "no catalog recorded for this job; pass --storage")
+            return
+        rating = safe_float(core["Rating"]) if core["Rating"] is not None else None
+        try:
+            storage.add_movie(core["Title"], core["Year"], rating, core["Poster"])
+        except ValueError:
+            pass  # already in the catalog
+        self.queue.complete(job)
+
+    def _storage_for(self, job: Job) -> Optional[IStorage]:
+        """The catalog a job was queued for, opened once per worker run."""
+        if job.storage is None:
+            return self.storage
+        if self.storage is not None and self.storage.location() == job.storage:
+            return self.storage
+        if job.storage not in self._opened:
+            self._opened[job.storage] = open_storage(job.storage)
+        return self._opened[job.storage]
+
+    def _close_opened(self) -> None:
+        for storage in self._opened.values():
+            close = getattr(storage, "close", None)  # StorageSqlite holds a connection
+            if close is not None:
+                close()
+        self._opened.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drain queued OMDb lookups into a catalog.")
+    parser.add_argument(
+        "--storage",
+        help="catalog file (.csv, .json, .sqlite3) for jobs queued without one; "
+        "other jobs go to the catalog they were queued from",
+    )
+    parser.add_argument("--queue", default=None, help=f"queue file (default: {default_queue_path()})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="max OMDb requests per second")
+    parser.add_argument("--follow", action="store_true", help="keep running and wait for new jobs")
+    args = parser.parse_args()
+
+    queue = LookupQueue(args.queue)
+    worker = QueueWorker(open_storage(args.storage) if args.storage else None, queue, rate=args.rate)
+    try:
+        worker.run(until_empty=not args.follow)
+    except OmdbAuthError as exc:
+        print(f"Stopped: {exc}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(", ".join(f"{status}: {count}" for status, count in queue.counts().items()))
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
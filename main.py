@@ -2,6 +2,7 @@
 
 from storage.storage_json import StorageJson
 from storage.storage_csv import StorageCsv
+from storage.storage_sqlite import StorageSqlite
 from movie_app import MovieApp
 
 
@@ -10,6 +11,9 @@ def main() -> None:
     Try per-user storage files to validate “multiple files” architecture:
     storage = StorageJson("john.json")
     storage = StorageJson("sara.json")
+
+    Large catalogs: swap in the SQLite backend with one line:
+    app = MovieApp(StorageSqlite("storage/movies.sqlite3"))
     """
 
     storage_csv = StorageCsv("storage/movies.csv")
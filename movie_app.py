@@ -6,13 +6,18 @@ CLI application class (menu + commands). No main() here.
 from __future__ import annotations
 
 import random
-from typing import Dict, Optional, Tuple
+import sqlite3
+from typing import List, Optional
 
 import matplotlib.pyplot as plt
 from colorama import Fore, Style
 
+from catalog_columns import MovieColumns
 from istorage import IStorage
+from lookup_queue import LookupQueue
 from movies import select_title_from_user_query
+from title_index import TitleIndex
+from title_trie import TitleTrie
 from utils import normalize_title
 from validators import (
     prompt_choice,
@@ -33,20 +38,7 @@ from src.omdb_client import (
     extract_core_fields,
     fetch_by_title,
 )
-
-
-def _year_to_int(value) -> Optional[int]:
-    """
-    Convert various OMDb/CSV year strings to an int year when possible.
-
-    Examples:
-        "1997" -> 1997
-        "2015–2019" -> 2015
-        "1997/II" -> 1997
-        None, "", invalid -> None
-    """
-    s = str(value or "").strip()
-    return int(s[:4]) if len(s) >= 4 and s[:4].isdigit() else None
+from src.imdb_offline import get_default_index
 
 
 class MovieApp:
@@ -67,6 +59,7 @@ class MovieApp:
     10. Sort by rating
     11. Sort by year
     12. Filter by rating/year
+    13. Bulk import titles from file
     """
 
     def __init__(self, storage: IStorage) -> None:
@@ -75,6 +68,81 @@ class MovieApp:
             storage: An implementation of IStorage (e.g., StorageJson or StorageCsv).
         """
         self._storage = storage
+        self._columns: Optional[MovieColumns] = None
+        self._columns_version = None
+        self._lookup_queue: Optional[LookupQueue] = None
+        self._titles: Optional[TitleIndex] = None
+        self._titles_version = None
+        self._trie: Optional[TitleTrie] = None
+        self._trie_version = None
+
+    def _catalog_columns(self) -> MovieColumns:
+        """Columnar view of the catalog, rebuilt only when the storage version changes."""
+        version = self._storage.version()
+        if self._columns is None or version is None or version != self._columns_version:
+            self._columns = MovieColumns(self._storage.iter_movies())
+            self._columns_version = version
+        return self._columns
+
+    def _title_index(self) -> TitleIndex:
+        """Normalized-title index, rebuilt only when the storage version changes."""
+        version = self._storage.version()
+        if self._titles is None or version is None or version != self._titles_version:
+            self._titles = TitleIndex(title for title, _ in self._storage.iter_movies())
+            self._titles_version = version
+        return self._titles
+
+    def _title_trie(self) -> TitleTrie:
+        """Prefix index for completions, rebuilt only when the storage version changes."""
+        version = self._storage.version()
+        if self._trie is None or version is None or version != self._trie_version:
+            self._trie = TitleTrie(
+                (title, record.get("rating")) for title, record in self._storage.iter_movies()
+            )
+            self._trie_version = version
+        return self._trie
+
+    def _titles_written(
+        self,
+        before,
+        added: str | None = None,
+        deleted: str | None = None,
+        rated: str | None = None,
+        rating: float | None = None,
+    ) -> None:
+        """
+        Apply this app's own write to the title indexes instead of rebuilding
+        them. `before` is the storage version read just before the write; an
+        index that wasn't current then is left to rebuild on next use.
+        `rating` belongs to `added` or `rated` (completions rank by it).
+        """
+        if before is None:
+            return
+        after = self._storage.version()
+        if self._titles is not None and before == self._titles_version:
+            if added is not None:
+                self._titles.add(added)
+            if deleted is not None:
+                self._titles.remove(deleted)
+            self._titles_version = after
+        if self._trie is not None and before == self._trie_version:
+            if added is not None or rated is not None:
+                self._trie.add(added if added is not None else rated, rating)
+            if deleted is not None:
+                self._trie.remove(deleted)
+            self._trie_version = after
+
+    def complete_titles(self, prefix: str, limit: int | None = None) -> List[str]:
+        """
+        Type-ahead: stored titles starting with `prefix` (case/spacing-
+        insensitive), highest rated first. Non-interactive, for any client.
+        """
+        return self._title_trie().complete(prefix, limit)
+
+    def _print_rows(self, columns: MovieColumns, indices) -> None:
+        for i in indices:
+            record = columns.records[i]
+            print(f"{columns.titles[i]} ({record.get('year', '?')}): {record.get('rating', '?')}")
 
     # ----------------- Commands (private) -----------------
     def _command_list_movies(self) -> None:
@@ -91,22 +159,28 @@ class MovieApp:
         """
         Add a movie by fetching real data from OMDb using only the title.
         Stores: Title, Year, Rating (IMDb), Poster URL.
+        With IMDB_OFFLINE_DB set, titles resolve from the local IMDb index instead.
         """
         title_input = prompt_title("Enter movie title: ")
 
         try:
-            payload = fetch_by_title(title_input)
-            core = extract_core_fields(payload)
+            offline_index = get_default_index()
+            if offline_index is not None:
+                core = offline_index.lookup(title_input)
+            else:
+                core = extract_core_fields(fetch_by_title(title_input))
 
             # Parse rating as float when possible
             rating_value = safe_float(core["Rating"]) if core["Rating"] is not None else None
 
+            version_before = self._storage.version()
             self._storage.add_movie(
                 title=core["Title"],
                 year=core["Year"],
                 rating=rating_value,
                 poster=core["Poster"],
             )
+            self._titles_written(version_before, added=core["Title"], rating=rating_value)
 
             print(
                 f'{Fore.GREEN}Added: {core["Title"]} ({core["Year"]})'
@@ -117,7 +191,7 @@ class MovieApp:
         except OmdbNotFound:
             print(f'{Fore.YELLOW}Movie not found on OMDb. Try a different title or exact name.{Style.RESET_ALL}')
         except OmdbRateLimit:
-            print(f'{Fore.YELLOW}OMDb free-tier rate limit reached. Please wait and try again.{Style.RESET_ALL}')
+            self._queue_lookup(title_input)
         except OmdbAuthError as exc:
             print(f'{Fore.RED}{exc} Set OMDB_API_KEY and retry.{Style.RESET_ALL}')
         except OmdbNetworkError as exc:
@@ -127,6 +201,23 @@ class MovieApp:
         except Exception as exc:  # safeguard
             print(f'{Fore.RED}Unexpected error: {exc}{Style.RESET_ALL}')
 
+    def _queue_lookup(self, title: str) -> None:
+        """Queue a rate-limited title for `python lookup_queue.py`; never raises."""
+        try:
+            if self._lookup_queue is None:
+                self._lookup_queue = LookupQueue()
+            self._lookup_queue.enqueue(title, self._storage.location())
+        except (sqlite3.Error, OSError) as exc:  # locked, disk full, no permission...
+            print(
+                f'{Fore.YELLOW}OMDb free-tier rate limit reached, and "{title}" could not be queued'
+                f' ({exc}). Try again later.{Style.RESET_ALL}'
+            )
+            return
+        print(
+            f'{Fore.YELLOW}OMDb free-tier rate limit reached. "{title}" was queued;'
+            f' run `python lookup_queue.py` to add it once the quota allows.{Style.RESET_ALL}'
+        )
+
     def _command_delete_movie(self) -> None:
         """Delete a movie using a safe, user-confirmed flow."""
         movies_dict = self._storage.list_movies()
@@ -134,8 +225,8 @@ class MovieApp:
             print("No movies in database.")
             return
 
-        user_input = prompt_title("Enter movie name to delete: ")
-        resolved_title = select_title_from_user_query(movies_dict, user_input)
+        user_input = prompt_title("Enter movie name to delete: ", completer=self.complete_titles)
+        resolved_title = select_title_from_user_query(movies_dict, user_input, self._title_index())
         if not resolved_title:
             return
 
@@ -152,7 +243,9 @@ class MovieApp:
             print("Deletion cancelled.")
             return
 
+        version_before = self._storage.version()
         self._storage.delete_movie(resolved_title)
+        self._titles_written(version_before, deleted=resolved_title)
         print(f"'{resolved_title}' successfully deleted.")
 
     def _command_update_movie(self) -> None:
@@ -162,13 +255,15 @@ class MovieApp:
             print("No movies in database.")
             return
 
-        user_input = prompt_title("Enter movie name to update: ")
-        resolved_title = select_title_from_user_query(movies_dict, user_input)
+        user_input = prompt_title("Enter movie name to update: ", completer=self.complete_titles)
+        resolved_title = select_title_from_user_query(movies_dict, user_input, self._title_index())
         if not resolved_title:
             return
 
         new_rating = prompt_rating()
+        version_before = self._storage.version()
         self._storage.update_movie(resolved_title, new_rating)
+        self._titles_written(version_before, rated=resolved_title, rating=new_rating)
         print(f"'{resolved_title}' updated with rating {new_rating}")
 
     def _command_stats(self) -> None:
@@ -176,27 +271,12 @@ class MovieApp:
         Compute and display simple statistics for stored movies:
         average, median, best title, worst title (by rating).
         """
-        movies_dict = self._storage.list_movies()
-        numeric_ratings = [
-            record.get("rating")
-            for record in movies_dict.values()
-            if isinstance(record.get("rating"), (int, float))
-        ]
-        if not numeric_ratings:
+        stats = self._catalog_columns().stats()
+        if stats is None:
             print("No rated movies in database.")
             return
 
-        average = sum(numeric_ratings) / len(numeric_ratings)
-        sorted_ratings = sorted(numeric_ratings)
-        median = sorted_ratings[len(sorted_ratings) // 2]
-
-        def rating_or_default(title: str, default: float) -> float:
-            value = movies_dict[title].get("rating")
-            return value if isinstance(value, (int, float)) else default
-
-        best_title = max(movies_dict, key=lambda t: rating_or_default(t, float("-inf")))
-        worst_title = min(movies_dict, key=lambda t: rating_or_default(t, float("inf")))
-
+        average, median, best_title, worst_title = stats
         print(f"Average: {average:.1f}, Median: {median}, Best: {best_title}, Worst: {worst_title}")
 
     def _command_random_movie(self) -> None:
@@ -213,10 +293,9 @@ class MovieApp:
 
     def _command_create_rating_histogram(self) -> None:
         """Create and save a histogram of all numeric movie ratings."""
-        movies_dict = self._storage.list_movies()
         numeric_ratings = [
             record.get("rating")
-            for record in movies_dict.values()
+            for _, record in self._storage.iter_movies()
             if isinstance(record.get("rating"), (int, float))
         ]
         if not numeric_ratings:
@@ -238,8 +317,8 @@ class MovieApp:
         if not movies_dict:
             print("No movies in database.")
             return
-        term = prompt_title("Enter part of movie name to search: ")
-        resolved = select_title_from_user_query(movies_dict, term)
+        term = prompt_title("Enter part of movie name to search: ", completer=self.complete_titles)
+        resolved = select_title_from_user_query(movies_dict, term, self._title_index())
         if resolved:
             record = movies_dict[resolved]
             print(f"{resolved} ({record.get('year', '?')}): {record.get('rating', '?')}")
@@ -261,39 +340,27 @@ class MovieApp:
 
     def _command_sort_movies_by_rating(self) -> None:
         """Display movies sorted by rating (highest first)."""
-        movies_dict = self._storage.list_movies()
-        if not movies_dict:
+        columns = self._catalog_columns()
+        if not len(columns):
             print("No movies in database.")
             return
 
-        def key_fn(item: Tuple[str, Dict]) -> float:
-            rating = item[1].get("rating")
-            return rating if isinstance(rating, (int, float)) else float("-inf")
-
-        for title, record in sorted(movies_dict.items(), key=key_fn, reverse=True):
-            print(f"{title} ({record.get('year', '?')}): {record.get('rating', '?')}")
+        self._print_rows(columns, columns.order_by_rating())
 
     def _command_sort_movies_by_year(self) -> None:
         """Display movies sorted by release year."""
-        movies_dict = self._storage.list_movies()
-        if not movies_dict:
+        columns = self._catalog_columns()
+        if not len(columns):
             print("No movies in database.")
             return
 
         latest_first = input("Show latest movies first? (y/n): ").strip().lower() == "y"
-
-        def key_fn(item: Tuple[str, Dict]) -> Tuple[bool, int]:
-            year_int = _year_to_int(item[1].get("year"))
-            # Sort None years to the end: (True/False, year)
-            return (year_int is None, year_int or 0)
-
-        for title, record in sorted(movies_dict.items(), key=key_fn, reverse=latest_first):
-            print(f"{title} ({record.get('year', '?')}): {record.get('rating', '?')}")
+        self._print_rows(columns, columns.order_by_year(latest_first))
 
     def _command_filter_movies(self) -> None:
         """Filter movies by minimum rating and/or a year range, then display matches."""
-        movies_dict = self._storage.list_movies()
-        if not movies_dict:
+        columns = self._catalog_columns()
+        if not len(columns):
             print("No movies in database.")
             return
 
@@ -302,26 +369,40 @@ class MovieApp:
         start_year = prompt_year_filter("Enter start year")
         end_year = prompt_year_filter("Enter end year")
 
-        filtered: list[tuple[str, str | int | None, float | None]] = []
-        for title, record in movies_dict.items():
-            year_int = _year_to_int(record.get("year"))
-            rating_val = record.get("rating")
+        matches = columns.filter(min_rating, start_year, end_year)
+        if not len(matches):
+            print("No movies match criteria.")
+            return
 
-            if min_rating is not None and (not isinstance(rating_val, (int, float)) or rating_val < min_rating):
-                continue
-            if start_year is not None and (year_int is None or year_int < start_year):
-                continue
-            if end_year is not None and (year_int is None or year_int > end_year):
-                continue
+        for i in matches:
+            record = columns.records[i]
+            year_text, rating_text = record.get("year"), record.get("rating")
+            print(f"{columns.titles[i]} ({year_text if year_text is not None else '?'}): {rating_text if rating_text is not None else '?'}")
 
-            filtered.append((title, record.get("year"), rating_val))
+    def _command_bulk_import(self) -> None:
+        """Import every title listed in a text/CSV file (resumable)."""
+        from bulk_import import run_bulk_import
 
-        if not filtered:
-            print("No movies match criteria.")
+        path = input("Enter path of the titles file (.txt or .csv): ").strip()
+        if not path:
+            print("Import cancelled.")
             return
-
-        for title, year_text, rating_text in filtered:
-            print(f"{title} ({year_text if year_text is not None else '?'}): {rating_text if rating_text is not None else '?'}")
+        try:
+            counts = run_bulk_import(self._storage, path)
+        except FileNotFoundError:
+            print(f"{Fore.RED}File not found: {path}{Style.RESET_ALL}")
+            return
+        except OmdbError as exc:
+            print(f"{Fore.RED}OMDb error: {exc}{Style.RESET_ALL}")
+            return
+        except (OSError, ValueError) as exc:  # e.g. permissions, not UTF-8, storage errors
+            print(f"{Fore.RED}Import failed: {exc}{Style.RESET_ALL}")
+            return
+        print(
+            f"{Fore.GREEN}Added {counts['added']}{Style.RESET_ALL} | duplicates {counts['duplicate']}"
+            f" | not found {counts['not_found']} | failed {counts['failed']}"
+            f" | already done {counts['skipped']}"
+        )
 
     # -------- Main loop --------
     def run(self) -> None:
@@ -339,11 +420,12 @@ class MovieApp:
             10: self._command_sort_movies_by_rating,
             11: self._command_sort_movies_by_year,
             12: self._command_filter_movies,
+            13: self._command_bulk_import,
         }
 
         while True:
             print(self.MENU_TEXT)
-            choice = prompt_choice(max_choice=12)
+            choice = prompt_choice(max_choice=13)
             if choice == 0:
                 print("Goodbye!")
                 return
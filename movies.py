@@ -4,16 +4,20 @@ movies.py -- minimal module exporting only
     (the resolver) used by movie_app.py
 """
 
-from typing import Dict
+from typing import Dict, Optional
 from validators import (
     prompt_index,
 )
-from utils import normalize_title, substring_matches, fuzzy_matches
+from title_index import TitleIndex
 
 
 # ----------------- Search & Selection -----------------
 
-def select_title_from_user_query(movies: Dict[str, dict], user_input: str) -> str | None:
+def select_title_from_user_query(
+    movies: Dict[str, dict],
+    user_input: str,
+    index: Optional[TitleIndex] = None,
+) -> str | None:
     """
     Resolve a user-entered movie title against existing records.
 
@@ -21,12 +25,13 @@ def select_title_from_user_query(movies: Dict[str, dict], user_input: str) -> st
         1) Exact match using normalized titles (`normalize_title`).
         2) Substring matches (case/space-insensitive). If multiple, show a
            numbered menu and let the user pick.
-        3) Fuzzy matches using RapidFuzz. If multiple, show a numbered list
-           with scores, then let the user pick.
+        3) Fuzzy matches using RapidFuzz (the best FUZZY_LIMIT). If multiple,
+           show a numbered list with scores, then let the user pick.
 
     Args:
         movies: A mapping from title to record dict (must contain 'year'/'rating').
         user_input: The raw string typed by the user.
+        index: Prebuilt TitleIndex over `movies`' titles; built on the fly when omitted.
 
     Side effects:
         - May print match lists and prompt for an index if multiple options exist.
@@ -34,16 +39,16 @@ def select_title_from_user_query(movies: Dict[str, dict], user_input: str) -> st
     Returns:
         The resolved canonical title string if a selection is made; otherwise None.
     """
-    titles = list(movies.keys())
-    norm_input = normalize_title(user_input)
+    if index is None:
+        index = TitleIndex(movies.keys())
 
     # Exact match
-    exact = [t for t in titles if normalize_title(t) == norm_input]
-    if exact:
-        return exact[0]
+    exact = index.exact(user_input)
+    if exact is not None:
+        return exact
 
     # Substring match
-    subs = substring_matches(titles, user_input)
+    subs = index.substring(user_input)
     if subs:
         if len(subs) == 1:
             return subs[0]
@@ -56,11 +61,11 @@ def select_title_from_user_query(movies: Dict[str, dict], user_input: str) -> st
         return None
 
     # Fuzzy match
-    fuzzy = fuzzy_matches(titles, user_input)
+    fuzzy = index.fuzzy(user_input)
     if fuzzy:
         print("Fuzzy matches:")
         for idx, (t, score) in enumerate(fuzzy, 1):
-            print(f"{idx}. {t} [score: {score}]")
+            print(f"{idx}. {t} [score: {score:.0f}]")
         idx_choice = prompt_index(len(fuzzy))
         if idx_choice is not None:
             return fuzzy[idx_choice][0]
@@ -0,0 +1,239 @@
+"""
+Offline title lookups from the public IMDb dataset dumps
+(https://datasets.imdbws.com: title.basics.tsv[.gz], title.ratings.tsv[.gz]).
+
+Build once (streams both files in fixed-size chunks, so memory stays flat
+over tens of millions of rows):
+    python -m src.imdb_offline title.basics.tsv.gz title.ratings.tsv.gz --db imdb.sqlite3
+Then set IMDB_OFFLINE_DB=imdb.sqlite3 and "Add movie" resolves titles
+without any network access.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import os
+import sqlite3
+import sys
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.omdb_client import OmdbNotFound
+from utils import normalize_title
+
+DEFAULT_CHUNK_SIZE = 50_000
+# tvEpisode alone is most of the dump; OMDb title lookups rarely want it.
+DEFAULT_TITLE_TYPES = frozenset(
+	{"movie", "tvMovie", "tvSeries", "tvMiniSeries", "tvSpecial", "short", "video"}
+)
+_NULL = "\\N"
+
+
+def _open_tsv(path: str | Path) -> TextIO:
+	"""Open a dump as text; .gz files are decompressed on the fly."""
+	path = Path(path)
+	if path.suffix == ".gz":
+		return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="\n")
+	return path.open("r", encoding="utf-8", newline="\n")
+
+
+def _iter_tsv(path: str | Path) -> Iterator[List[str]]:
+	"""
+	Rows of an IMDb TSV file without the header. The dumps don't quote
+	fields (titles may contain '"'), so lines are split on tabs directly.
+	"""
+	with _open_tsv(path) as f:
+		next(f, None)
+		for line in f:
+			yield line.rstrip("\n").split("\t")
+
+
+def _chunks(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+	rows = iter(rows)
+	while chunk := list(islice(rows, size)):
+		yield chunk
+
+
+def _omdb_year(start: str, end: str, title_type: str) -> Optional[str]:
+	"""OMDb-style year: "1997", "2015–2019", or "2015–" for a running series."""
+	if start == _NULL:
+		return None
+	if end != _NULL:
+		return f"{start}–{end}"
+	if title_type in ("tvSeries", "tvMiniSeries"):
+		return f"{start}–"
+	return start
+
+
+def build_index(
+	basics_path: str | Path,
+	ratings_path: str | Path,
+	db_path: str | Path,
+	*,
+	title_types: FrozenSet[str] = DEFAULT_TITLE_TYPES,
+	chunk_size: int = DEFAULT_CHUNK_SIZE,
+	show_progress: bool = True,
+) -> int:
+	"""
+	Build the lookup database from the two dumps.
+
+	Ratings are loaded into a keyed table first; basics are then read in
+	chunks of `chunk_size`, each chunk staged and joined to the ratings in
+	SQL. The database is written next to `db_path` and moved into place
+	when complete, so a failed build never leaves a half-filled index.
+
+	Returns:
+		Number of titles indexed.
+	"""
+	db_path = Path(db_path)
+	tmp_path = db_path.with_name(db_path.name + ".building")
+	tmp_path.unlink(missing_ok=True)
+	conn = sqlite3.connect(tmp_path, isolation_level=None)
+	try:
+		# Throwaway file until the final rename: skip journaling and fsyncs.
+		conn.execute("PRAGMA journal_mode=OFF")
+		conn.execute("PRAGMA synchronous=OFF")
+		conn.execute("CREATE TABLE ratings (tconst TEXT PRIMARY KEY, rating TEXT, votes INTEGER) WITHOUT ROWID")
+		conn.execute("CREATE TEMP TABLE staging (tconst TEXT, title TEXT, title_key TEXT, year TEXT)")
+		conn.execute(
+			"""
+			CREATE TABLE titles (
+				tconst    TEXT PRIMARY KEY,
+				title     TEXT NOT NULL,
+				title_key TEXT NOT NULL,
+				year      TEXT,
+				rating    TEXT,
+				votes     INTEGER NOT NULL
+			)
+			"""
+		)
+
+		def progress(label: str, count: int) -> None:
+			if show_progress:
+				print(f"\r{label}: {count:,} rows", end="", file=sys.stderr, flush=True)
+
+		ratings = ((row[0], row[1], int(row[2])) for row in _iter_tsv(ratings_path) if len(row) >= 3)
+		loaded = 0
+		for chunk in _chunks(ratings, chunk_size):
+			conn.execute("BEGIN")
+			conn.executemany("INSERT OR REPLACE INTO ratings VALUES (?, ?, ?)", chunk)
+			conn.execute("COMMIT")
+			loaded += len(chunk)
+			progress("ratings", loaded)
+
+		# tconst, titleType, primaryTitle, originalTitle, isAdult, startYear, endYear, ...
+		basics = (
+			(row[0], row[2], normalize_title(row[2]), _omdb_year(row[5], row[6], row[1]))
+			for row in _iter_tsv(basics_path)
+			if len(row) >= 7 and row[1] in title_types
+		)
+		indexed = 0
+		if show_progress:
+			print(file=sys.stderr)
+		for chunk in _chunks(basics, chunk_size):
+			conn.execute("BEGIN")
+			conn.executemany("INSERT INTO staging VALUES (?, ?, ?, ?)", chunk)
+			conn.execute(
+				"""
+				INSERT OR REPLACE INTO titles
+				SELECT s.tconst, s.title, s.title_key, s.year, r.rating, COALESCE(r.votes, 0)
+				FROM staging AS s LEFT JOIN ratings AS r ON r.tconst = s.tconst
+				"""
+			)
+			conn.execute("DELETE FROM staging")
+			conn.execute("COMMIT")
+			indexed += len(chunk)
+			progress("titles", indexed)
+
+		# Built after the bulk load: one sort instead of a B-tree insert per row.
+		conn.execute("CREATE INDEX idx_titles_key ON titles (title_key, votes DESC)")
+		conn.execute("DROP TABLE ratings")
+		conn.execute("VACUUM")
+		if show_progress:
+			print(file=sys.stderr)
+	finally:
+		conn.close()
+	os.replace(tmp_path, db_path)
+	return indexed
+
+
+class OfflineIndex:
+	"""
+	Read-only lookups in a database made by build_index().
+
+	Thread-safe: one connection guarded by a lock.
+	"""
+
+	def __init__(self, path: str | Path) -> None:
+		self.path = Path(path)
+		if not self.path.exists():
+			raise FileNotFoundError(f"Offline IMDb index not found: {self.path}")
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+
+	def lookup(self, title: str, year: Optional[str] = None) -> Dict[str, Optional[str]]:
+		"""
+		Best match for an exact (normalized) title, optionally in a given
+		start year; the most-voted title wins, like OMDb's ?t= lookup.
+		Returns the extract_core_fields() shape (Poster is always None:
+		the dumps carry no images).
+
+		Raises:
+			OmdbNotFound
+		"""
+		query = "SELECT title, year, rating FROM titles WHERE title_key = ?"
+		params: Tuple = (normalize_title(title),)
+		if year:
+			query += " AND substr(year, 1, 4) = ?"
+			params += (str(year)[:4],)
+		with self._lock:
+			row = self._conn.execute(query + " ORDER BY votes DESC LIMIT 1", params).fetchone()
+		if row is None:
+			raise OmdbNotFound("Movie not found.")
+		found_title, found_year, rating = row
+		return {"Title": found_title, "Year": found_year, "Rating": rating, "Poster": None}
+
+	def close(self) -> None:
+		with self._lock:
+			self._conn.close()
+
+
+_default_index: Optional[OfflineIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_index() -> Optional[OfflineIndex]:
+	"""
+	Process-wide index from the IMDB_OFFLINE_DB environment variable
+	(unset or empty: no offline index, lookups go to OMDb).
+	"""
+	global _default_index
+	path = os.getenv("IMDB_OFFLINE_DB", "").strip()
+	if not path:
+		return None
+	with _default_index_lock:
+		if _default_index is None:
+			_default_index = OfflineIndex(path)
+		return _default_index
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+	parser = argparse.ArgumentParser(description="Build an offline title index from IMDb TSV dumps.")
+	parser.add_argument("basics", help="title.basics.tsv or title.basics.tsv.gz")
+	parser.add_argument("ratings", help="title.ratings.tsv or title.ratings.tsv.gz")
+	parser.add_argument("--db", default="imdb.sqlite3", help="output database (default: imdb.sqlite3)")
+	parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+	parser.add_argument("--include-episodes", action="store_true", help="also index tvEpisode rows")
+	args = parser.parse_args(argv)
+
+	title_types = DEFAULT_TITLE_TYPES | {"tvEpisode"} if args.include_episodes else DEFAULT_TITLE_TYPES
+	count = build_index(args.basics, args.ratings, args.db, title_types=title_types, chunk_size=args.chunk_size)
+	print(f"Indexed {count:,} titles into {args.db}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,113 @@
+"""
+Concurrent bulk OMDb lookups with token-bucket rate limiting.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Set
+
+from src.omdb_client import OmdbClient, OmdbError
+
+# Free tier: 1,000 requests/day. Paid plans allow far more; set `rate` to match.
+DEFAULT_RATE = 10.0  # requests per second
+DEFAULT_WORKERS = 8
+
+
+class TokenBucket:
+	"""
+	Thread-safe token bucket: `rate` tokens are added per second, up to
+	`capacity` (the allowed burst). acquire() blocks until a token is free.
+	"""
+
+	def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+		if rate <= 0:
+			raise ValueError("rate must be positive")
+		self.rate = rate
+		self.capacity = capacity if capacity is not None else max(1.0, rate)
+		self._tokens = self.capacity
+		self._updated = time.monotonic()
+		self._lock = threading.Lock()
+
+	def acquire(self, tokens: float = 1.0) -> None:
+		while True:
+			with self._lock:
+				now = time.monotonic()
+				self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+				self._updated = now
+				if self._tokens >= tokens:
+					self._tokens -= tokens
+					return
+				wait_for = (tokens - self._tokens) / self.rate
+			time.sleep(wait_for)
+
+
+class BulkResult(NamedTuple):
+	"""Outcome of one title: `payload` on success, otherwise `error` (an OmdbError)."""
+	title: str
+	payload: Optional[Dict[str, str]]
+	error: Optional[OmdbError]
+
+
+def fetch_many(
+	titles: Iterable[str],
+	*,
+	client: Optional[OmdbClient] = None,
+	max_workers: int = DEFAULT_WORKERS,
+	rate: float = DEFAULT_RATE,
+	burst: Optional[float] = None,
+	limiter: Optional[TokenBucket] = None,
+) -> Iterator[BulkResult]:
+	"""
+	Look up many titles concurrently and yield results as they complete
+	(not in input order).
+
+	- At most `max_workers` requests run at once and only about twice that
+	  many titles are pulled from `titles`, so huge inputs stream through.
+	- Network requests share a token bucket (`rate` per second, `burst`);
+	  cache hits don't spend tokens. Pass `limiter` to share one bucket
+	  between several calls.
+	- A failing title yields a BulkResult with `error` set (OmdbNotFound,
+	  OmdbRateLimit, OmdbNetworkError, ...); the batch carries on.
+	"""
+	owns_client = client is None
+	if client is None:
+		client = OmdbClient(pool_size=max_workers)
+	if limiter is None:
+		limiter = TokenBucket(rate, burst)
+
+	def fetch_one(title: str) -> BulkResult:
+		try:
+			# The client checks its cache once and takes a token only for a real request.
+			return BulkResult(title, client.fetch_by_title(title, before_request=limiter.acquire), None)
+		except OmdbError as exc:
+			return BulkResult(title, None, exc)
+		except Exception as exc:  # safeguard: never abort the batch
+			return BulkResult(title, None, OmdbError(f"Unexpected error: {exc}"))
+
+	window = max_workers * 2
+	pending: Set[Future] = set()
+	title_iter = iter(titles)
+	pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="omdb")
+	try:
+		exhausted = False
+		while True:
+			while not exhausted and len(pending) < window:
+				title = next(title_iter, None)
+				if title is None:
+					exhausted = True
+				else:
+					pending.add(pool.submit(fetch_one, title))
+			if not pending:
+				return
+			done, pending = wait(pending, return_when=FIRST_COMPLETED)
+			for future in done:
+				yield future.result()
+	finally:
+		# On an early close, drop queued titles before waiting: only the
+		# requests already running are finished, not the rest of the window.
+		pool.shutdown(wait=True, cancel_futures=True)
+		if owns_client:
+			client.close()
@@ -0,0 +1,213 @@
+"""
+Persistent response cache for OMDb lookups (SQLite-backed).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from utils import normalize_title
+
+CACHE_FILE_NAME = "omdb_cache.sqlite3"
+DEFAULT_TTL = 30 * 24 * 3600.0  # successful lookups: 30 days
+DEFAULT_NEGATIVE_TTL = 24 * 3600.0  # "Movie not found!": 1 day
+DEFAULT_MAX_ENTRIES = 50_000
+# Memory-layer hits are written back to accessed_at in batches of this size.
+TOUCH_BATCH = 256
+
+
+def user_cache_dir() -> Path:
+	"""
+	Per-user directory for the app's local state, not the working directory:
+	    Windows  %LOCALAPPDATA%/movie-project
+	    macOS    ~/Library/Caches/movie-project
+	    other    $XDG_CACHE_HOME (default ~/.cache)/movie-project
+	"""
+	if sys.platform == "win32":
+		base = Path(os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+	elif sys.platform == "darwin":
+		base = Path.home() / "Library" / "Caches"
+	else:
+		base = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+	return base / "movie-project"
+
+
+def default_cache_path() -> Path:
+	"""The lookup cache file inside user_cache_dir()."""
+	return user_cache_dir() / CACHE_FILE_NAME
+
+
+class OmdbCache:
+	"""
+	Disk-backed cache of raw OMDb payloads keyed by the normalized title.
+
+	- Entries expire after `ttl` seconds (`negative_ttl` for not-found results).
+	- Not-found results are cached too (negative caching), payload NULL.
+	- At most `max_entries` rows are kept; the least recently used are evicted.
+	- A small in-process LRU in front of SQLite serves repeat hits without I/O;
+	  their access times reach disk in batches, so eviction stays LRU.
+
+	Thread-safe: one connection guarded by a lock.
+	"""
+
+	def __init__(
+		self,
+		path: str | Path | None = None,
+		*,
+		ttl: float = DEFAULT_TTL,
+		negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+		max_entries: int = DEFAULT_MAX_ENTRIES,
+		memory_entries: int = 1024,
+	) -> None:
+		self.ttl = ttl
+		self.negative_ttl = negative_ttl
+		self.max_entries = max_entries
+		self._memory_entries = memory_entries
+		# key -> (payload | None, fetched_at)
+		self._memory: "OrderedDict[str, Tuple[Optional[Dict[str, str]], float]]" = OrderedDict()
+		# key -> last access time of memory hits not yet written to disk
+		self._touched: Dict[str, float] = {}
+		self._lock = threading.Lock()
+		path = Path(path) if path is not None else default_cache_path()
+		path.parent.mkdir(parents=True, exist_ok=True)
+		self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		# It's a cache: losing the last writes on power loss is fine.
+		self._conn.execute("PRAGMA synchronous=OFF")
+		self._conn.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS responses (
+				key         TEXT PRIMARY KEY,
+				payload     TEXT,
+				fetched_at  REAL NOT NULL,
+				accessed_at REAL NOT NULL
+			)
+			"""
+		)
+		self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+		(self._count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+
+	def get(self, title: str) -> Tuple[bool, Optional[Dict[str, str]]]:
+		"""
+		Returns (hit, payload). A hit with payload None is a cached "not found".
+		"""
+		key = normalize_title(title)
+		now = time.time()
+		with self._lock:
+			entry = self._memory.get(key)
+			if entry is None:
+				row = self._conn.execute(
+					"SELECT payload, fetched_at FROM responses WHERE key = ?", (key,)
+				).fetchone()
+				if row is None:
+					return False, None
+				entry = (None if row[0] is None else json.loads(row[0]), row[1])
+				self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+				self._remember(key, entry)
+			else:
+				self._memory.move_to_end(key)
+				self._touched[key] = now
+				if len(self._touched) >= TOUCH_BATCH:
+					self._write_touched()
+
+			payload, fetched_at = entry
+			if now - fetched_at > (self.ttl if payload is not None else self.negative_ttl):
+				self._forget(key)
+				return False, None
+			return True, payload
+
+	def put(self, title: str, payload: Optional[Dict[str, str]]) -> None:
+		"""Store a payload, or None to record that the title was not found."""
+		key = normalize_title(title)
+		now = time.time()
+		with self._lock:
+			existed = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+			self._conn.execute(
+				"INSERT OR REPLACE INTO responses (key, payload, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+				(key, None if payload is None else json.dumps(payload), now, now),
+			)
+			if not existed:
+				self._count += 1
+			self._remember(key, (payload, now))
+			if self._count > self.max_entries:
+				self._evict()
+
+	def clear(self) -> None:
+		with self._lock:
+			self._conn.execute("DELETE FROM responses")
+			self._memory.clear()
+			self._touched.clear()
+			self._count = 0
+
+	def close(self) -> None:
+		with self._lock:
+			self._write_touched()
+			self._conn.close()
+
+	# ----- internals (caller holds the lock) -----
+	def _remember(self, key: str, entry: Tuple[Optional[Dict[str, str]], float]) -> None:
+		self._memory[key] = entry
+		self._memory.move_to_end(key)
+		while len(self._memory) > self._memory_entries:
+			self._memory.popitem(last=False)
+
+	def _write_touched(self) -> None:
+		if self._touched:
+			self._conn.execute("BEGIN")  # one transaction for the whole batch
+			try:
+				self._conn.executemany(
+					"UPDATE responses SET accessed_at = ? WHERE key = ?",
+					[(accessed_at, key) for key, accessed_at in self._touched.items()],
+				)
+			except BaseException:
+				self._conn.execute("ROLLBACK")
+				raise
+			self._conn.execute("COMMIT")
+			self._touched.clear()
+
+	def _forget(self, key: str) -> None:
+		self._memory.pop(key, None)
+		self._touched.pop(key, None)
+		if self._conn.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount:
+			self._count -= 1
+
+	def _evict(self) -> None:
+		# Drop the least recently used tenth in one statement to amortize the cost.
+		self._write_touched()
+		target = int(self.max_entries * 0.9)
+		self._conn.execute(
+			"DELETE FROM responses WHERE key IN "
+			"(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+			(self._count - target,),
+		)
+		(self._count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+		self._memory.clear()
+
+
+_default_cache: Optional[OmdbCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[OmdbCache]:
+	"""
+	Process-wide cache configured from the environment:
+	    OMDB_CACHE_PATH  file location (default: default_cache_path(); empty disables)
+	    OMDB_CACHE_TTL   seconds a successful lookup stays fresh
+	"""
+	global _default_cache
+	path = os.getenv("OMDB_CACHE_PATH")
+	if path is not None and not path.strip():
+		return None
+	with _default_cache_lock:
+		if _default_cache is None:
+			ttl = float(os.getenv("OMDB_CACHE_TTL", "") or DEFAULT_TTL)
+			_default_cache = OmdbCache(path.strip() if path else None, ttl=ttl)
+		return _default_cache
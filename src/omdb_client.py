@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, Optional
+import threading
+import time
+from typing import Callable, Dict, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from src.omdb_cache import OmdbCache, get_default_cache
+from src.omdb_quota import QuotaLedger, get_default_ledger
+from src.omdb_resilience import CircuitBreaker, RetryPolicy, SingleFlight
+from utils import normalize_title
 
 # loads variables from .env if present
 load_dotenv()
 
-OMDB_BASE_URL = "http://www.omdbapi.com"
+# Overridable to point at a local stand-in (src/omdb_stub_server.py).
+OMDB_BASE_URL = os.getenv("OMDB_BASE_URL", "http://www.omdbapi.com")
 
 class OmdbError(Exception):
 	"""Base error for OMDB client"""
@@ -34,26 +43,202 @@ def get_api_key() -> str:
 		)
 	return key
 
-def fetch_by_title(title: str, *, timeout: float = 8.0) -> Dict[str, str]:
+_DEFAULT = object()
+
+
+class OmdbClient:
 	"""
-    Fetch a single movie by exact title using the 't' parameter.
-    Returns a dict with Title, Year, imdbRating, Poster, etc. (raw OMDb payload).
+	Reusable OMDb client that owns a requests.Session, so consecutive lookups
+	reuse pooled keep-alive connections instead of opening a new TCP (and TLS)
+	connection each time.
 
-    Raises:
-        OmdbNotFound, OmdbAuthError, OmdbRateLimit, OmdbNetworkError
-    """
-	params = {
-		"apikey": get_api_key(),
-		"t": title,
-		"r": "json",
-	}
+	Args:
+		api_key:   OMDb key; defaults to OMDB_API_KEY, read on each request.
+		base_url:  API endpoint (OMDB_BASE_URL by default).
+		timeout:   default per-request timeout in seconds.
+		pool_size: max pooled connections kept alive per host; size it to the
+		           number of threads sharing the client.
+		cache:     OmdbCache to consult first; the env-configured default
+		           unless given, None disables caching.
+		retry:     RetryPolicy for OmdbNetworkError (timeouts, connection
+		           errors, HTTP 5xx); NO_RETRY disables retries.
+		breaker:   CircuitBreaker that fails fast while upstream is unhealthy;
+		           inspect it via `client.breaker.state`. None disables it.
+		coalesce:  share one in-flight request between threads asking for
+		           the same (normalized) title at the same time.
+		quota:     QuotaLedger shared with other processes using the key;
+		           every request reserves from it first and raises
+		           OmdbRateLimit locally once the day's budget is spent.
+		           The env-configured default unless given, None disables it.
+	"""
+
+	def __init__(
+		self,
+		api_key: Optional[str] = None,
+		*,
+		base_url: str = OMDB_BASE_URL,
+		timeout: float = 8.0,
+		pool_size: int = 10,
+		cache=_DEFAULT,
+		retry: Optional[RetryPolicy] = None,
+		breaker=_DEFAULT,
+		coalesce: bool = True,
+		quota=_DEFAULT,
+	) -> None:
+		self._api_key = api_key
+		self.quota: Optional[QuotaLedger] = get_default_ledger() if quota is _DEFAULT else quota
+		self.flights: Optional[SingleFlight] = SingleFlight() if coalesce else None
+		self.retry = retry if retry is not None else RetryPolicy()
+		self.breaker: Optional[CircuitBreaker] = CircuitBreaker() if breaker is _DEFAULT else breaker
+		self.base_url = base_url
+		self.timeout = timeout
+		self.cache: Optional[OmdbCache] = get_default_cache() if cache is _DEFAULT else cache
+		self._session = requests.Session()
+		# Retries are handled (or not) by callers; the adapter only pools.
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+		self._session.mount("http://", adapter)
+		self._session.mount("https://", adapter)
+
+	def fetch_by_title(
+		self,
+		title: str,
+		*,
+		timeout: Optional[float] = None,
+		cache=_DEFAULT,
+		before_request: Optional[Callable[[], None]] = None,
+	) -> Dict[str, str]:
+		"""
+	    Fetch a single movie by exact title using the 't' parameter.
+	    Returns a dict with Title, Year, imdbRating, Poster, etc. (raw OMDb payload).
+
+	    Successful payloads and "not found" answers are cached; other errors
+	    are not. `cache` overrides the client's cache for this call.
+	    Concurrent misses for the same title share one request (see `coalesce`).
+	    `before_request` runs before every request actually sent, retries
+	    included, e.g. to take a rate-limiter token (cache hits and coalesced
+	    waiters skip it).
+
+	    Raises:
+	        OmdbNotFound, OmdbAuthError, OmdbRateLimit, OmdbNetworkError
+	    """
+		if cache is _DEFAULT:
+			cache = self.cache
+		if cache is not None:
+			hit, payload = cache.get(title)
+			if hit:
+				if payload is None:
+					raise OmdbNotFound("Movie not found.")
+				return payload
+
+		def lookup() -> Dict[str, str]:
+			try:
+				payload = self._request(title, self.timeout if timeout is None else timeout, before_request)
+			except OmdbNotFound:
+				if cache is not None:
+					cache.put(title, None)
+				raise
+			if cache is not None:
+				cache.put(title, payload)
+			return payload
+
+		if self.flights is None:
+			return lookup()
+		return self.flights.do(normalize_title(title), lookup)
+
+	def remaining_quota(self) -> Optional[int]:
+		"""Requests left today for this key per the quota ledger (None without one)."""
+		if self.quota is None:
+			return None
+		return self.quota.remaining(self._api_key or get_api_key())
+
+	def close(self) -> None:
+		"""Close pooled connections."""
+		self._session.close()
+
+	def __enter__(self) -> "OmdbClient":
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.close()
+
+	def _request(
+		self,
+		title: str,
+		timeout: float,
+		before_request: Optional[Callable[[], None]] = None,
+	) -> Dict[str, str]:
+		"""One lookup, retried with backoff on transient errors, behind the breaker."""
+		api_key = self._api_key or get_api_key()
+		delays = self.retry.delays()
+		while True:
+			if before_request is not None:
+				before_request()  # every attempt goes through the limiter, not just the first
+			if self.breaker is not None and not self.breaker.allow():
+				raise OmdbNetworkError("OMDb circuit breaker is open; failing fast. Try again later.")
+			# Reserve only once a request will really go out: fast-failed calls are free.
+			if self.quota is not None and not self.quota.reserve(api_key):
+				if self.breaker is not None:
+					self.breaker.release()  # no call was made; hand back a half-open probe slot
+				raise OmdbRateLimit("Daily OMDb quota for this API key is used up.")
+			try:
+				payload = self._request_once(title, api_key, timeout)
+			except OmdbNetworkError:
+				if self.breaker is not None:
+					self.breaker.record_failure()
+				delay = next(delays, None)
+				if delay is None:
+					raise
+				time.sleep(delay)
+				continue
+			except OmdbError as exc:
+				# Upstream answered (not found, auth, rate limit): it is healthy.
+				if self.breaker is not None:
+					self.breaker.record_success()
+				if isinstance(exc, OmdbRateLimit) and self.quota is not None:
+					self.quota.mark_exhausted(api_key)
+				raise
+			except Exception:
+				# Anything else still ends the call; a half-open breaker must
+				# hear about it or its probe slot would stay claimed forever.
+				if self.breaker is not None:
+					self.breaker.record_failure()
+				raise
+			except BaseException:
+				if self.breaker is not None:
+					self.breaker.release()
+				raise
+			if self.breaker is not None:
+				self.breaker.record_success()
+			return payload
+
+	def _request_once(self, title: str, api_key: str, timeout: float) -> Dict[str, str]:
+		params = {
+			"apikey": api_key,
+			"t": title,
+			"r": "json",
+		}
+		try:
+			response = self._session.get(self.base_url, params=params, timeout=timeout)
+		except requests.exceptions.RequestException as e:
+			raise OmdbNetworkError(f"Network error: {e}") from e
+		return _parse_response(response)
+
+
+def _error_message(response: requests.Response) -> str:
+	"""Lower-cased "Error" field of a JSON error body, or "" if there is none."""
 	try:
-		response = requests.get(OMDB_BASE_URL, params=params, timeout=timeout)
-	except requests.exceptions.RequestException as e:
-		raise OmdbNetworkError(f"Network error: {e}") from e
+		return str(response.json().get("Error") or "").lower()
+	except (ValueError, AttributeError):
+		return ""
+
 
+def _parse_response(response: requests.Response) -> Dict[str, str]:
+	"""Map an OMDb HTTP response onto a payload or the OmdbError hierarchy."""
 	# Some OMDb errors are returned as 200 with an "Error" field.
 	if response.status_code == 401:
+		# OMDb also answers the daily request limit with a 401.
+		if "limit" in _error_message(response):
+			raise OmdbRateLimit("OMDb free tier rate limit reached.")
 		raise OmdbAuthError("Invalid or missing API key (HTTP 401).")
 	if response.status_code == 403:
 		raise OmdbAuthError("Access forbidden (HTTP 403).")
@@ -81,6 +266,31 @@ def fetch_by_title(title: str, *, timeout: float = 8.0) -> Dict[str, str]:
 	return data
 
 
+_default_client: Optional[OmdbClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> OmdbClient:
+	"""Process-wide client shared by the module-level helpers."""
+	global _default_client
+	with _default_client_lock:
+		if _default_client is None:
+			_default_client = OmdbClient()
+		return _default_client
+
+
+def fetch_by_title(title: str, *, timeout: float = 8.0, cache=_DEFAULT) -> Dict[str, str]:
+	"""
+    Fetch a single movie by exact title (see OmdbClient.fetch_by_title).
+    Thin wrapper around the shared default client, so repeated calls reuse
+    its keep-alive connection pool and cache.
+
+    Raises:
+        OmdbNotFound, OmdbAuthError, OmdbRateLimit, OmdbNetworkError
+    """
+	return get_default_client().fetch_by_title(title, timeout=timeout, cache=cache)
+
+
 def extract_core_fields(payload: Dict[str, str]) -> Dict[str, Optional[str]]:
 	"""
 	Normalize the raw OMDb payload to the 4 fields my app needs.
@@ -0,0 +1,129 @@
+"""
+Daily OMDb request quota shared by every process using the same API key
+(SQLite-backed ledger).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from src.omdb_cache import user_cache_dir
+
+QUOTA_FILE_NAME = "omdb_quota.sqlite3"
+DEFAULT_DAILY_LIMIT = 1000  # OMDb free tier
+
+
+def default_quota_path() -> Path:
+	"""The ledger file inside the per-user directory of the lookup cache."""
+	return user_cache_dir() / QUOTA_FILE_NAME
+
+
+def _key_id(api_key: str) -> str:
+	"""The ledger stores a digest, never the key itself."""
+	return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _today() -> str:
+	"""OMDb quotas are per UTC day."""
+	return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class QuotaLedger:
+	"""
+	Requests issued per API key per UTC day, shared across processes.
+
+	Callers reserve() budget before each request; the check and the
+	increment run in one BEGIN IMMEDIATE transaction, so concurrent
+	processes can never overspend `daily_limit` together. When OMDb itself
+	reports the limit, mark_exhausted() brings the ledger in line.
+
+	Thread-safe: one connection guarded by a lock.
+	"""
+
+	def __init__(self, path: str | Path | None = None, *, daily_limit: int = DEFAULT_DAILY_LIMIT) -> None:
+		path = Path(path) if path is not None else default_quota_path()
+		path.parent.mkdir(parents=True, exist_ok=True)
+		self.daily_limit = daily_limit
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		self._conn.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS usage (
+				key_id TEXT NOT NULL,
+				day    TEXT NOT NULL,
+				used   INTEGER NOT NULL,
+				PRIMARY KEY (key_id, day)
+			) WITHOUT ROWID
+			"""
+		)
+
+	def reserve(self, api_key: str, count: int = 1) -> bool:
+		"""Take `count` requests from today's budget; False (nothing taken) if it doesn't fit."""
+		key, day = _key_id(api_key), _today()
+		with self._lock:
+			self._conn.execute("BEGIN IMMEDIATE")
+			try:
+				used = self._used(key, day)
+				if used + count > self.daily_limit:
+					self._conn.execute("ROLLBACK")
+					return False
+				self._conn.execute(
+					"INSERT OR REPLACE INTO usage (key_id, day, used) VALUES (?, ?, ?)",
+					(key, day, used + count),
+				)
+				self._conn.execute("COMMIT")
+				return True
+			except BaseException:
+				self._conn.execute("ROLLBACK")
+				raise
+
+	def remaining(self, api_key: str) -> int:
+		"""Requests left today for this key."""
+		with self._lock:
+			used = self._used(_key_id(api_key), _today())
+		return max(self.daily_limit - used, 0)
+
+	def mark_exhausted(self, api_key: str) -> None:
+		"""Record that OMDb refused further requests today (e.g. another client used the key)."""
+		key, day = _key_id(api_key), _today()
+		with self._lock:
+			used = max(self._used(key, day), self.daily_limit)
+			self._conn.execute(
+				"INSERT OR REPLACE INTO usage (key_id, day, used) VALUES (?, ?, ?)", (key, day, used)
+			)
+
+	def close(self) -> None:
+		with self._lock:
+			self._conn.close()
+
+	def _used(self, key: str, day: str) -> int:
+		row = self._conn.execute("SELECT used FROM usage WHERE key_id = ? AND day = ?", (key, day)).fetchone()
+		return 0 if row is None else row[0]
+
+
+_default_ledger: Optional[QuotaLedger] = None
+_default_ledger_lock = threading.Lock()
+
+
+def get_default_ledger() -> Optional[QuotaLedger]:
+	"""
+	Process-wide ledger configured from the environment:
+	    OMDB_QUOTA_PATH   file location (default: default_quota_path())
+	    OMDB_DAILY_LIMIT  requests per key per day (default 1000; 0 disables)
+	"""
+	global _default_ledger
+	limit = int(os.getenv("OMDB_DAILY_LIMIT", "") or DEFAULT_DAILY_LIMIT)
+	if limit <= 0:
+		return None
+	with _default_ledger_lock:
+		if _default_ledger is None:
+			path = os.getenv("OMDB_QUOTA_PATH", "").strip() or None
+			_default_ledger = QuotaLedger(path, daily_limit=limit)
+		return _default_ledger
@@ -0,0 +1,192 @@
+"""
+Retry policy, circuit breaker and request coalescing used by OmdbClient.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterator, Optional, TypeVar
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+	"""
+	Exponential backoff with "full jitter": before retry n (1-based) wait a
+	random time in [0, min(max_delay, base_delay * 2**(n-1))]. With
+	jitter=False the upper bound is used as-is.
+	"""
+
+	def __init__(
+		self,
+		max_attempts: int = 3,
+		base_delay: float = 0.5,
+		max_delay: float = 8.0,
+		jitter: bool = True,
+	) -> None:
+		if max_attempts < 1:
+			raise ValueError("max_attempts must be at least 1")
+		self.max_attempts = max_attempts
+		self.base_delay = base_delay
+		self.max_delay = max_delay
+		self.jitter = jitter
+
+	def delays(self) -> Iterator[float]:
+		"""Wait times before each retry (max_attempts - 1 of them)."""
+		for n in range(self.max_attempts - 1):
+			cap = min(self.max_delay, self.base_delay * (2 ** n))
+			yield random.uniform(0, cap) if self.jitter else cap
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitBreaker:
+	"""
+	Error-rate circuit breaker.
+
+	closed:    calls pass; outcomes of the last `window` calls are tracked.
+	           Once at least `min_calls` were seen and the failure ratio
+	           reaches `failure_threshold`, the breaker opens.
+	open:      calls fail fast until `cooldown` seconds have passed.
+	half_open: one probe call is let through; success closes the breaker,
+	           failure opens it again for another cooldown.
+	"""
+
+	def __init__(
+		self,
+		failure_threshold: float = 0.5,
+		window: int = 20,
+		min_calls: int = 5,
+		cooldown: float = 30.0,
+	) -> None:
+		self.failure_threshold = failure_threshold
+		self.min_calls = min_calls
+		self.cooldown = cooldown
+		self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failure
+		self._state = CLOSED
+		self._opened_at = 0.0
+		self._probe_in_flight = False
+		self._lock = threading.Lock()
+
+	@property
+	def state(self) -> str:
+		"""CLOSED, OPEN or HALF_OPEN (an expired OPEN reports HALF_OPEN)."""
+		with self._lock:
+			if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+				return HALF_OPEN
+			return self._state
+
+	def snapshot(self) -> Dict[str, object]:
+		"""State plus the numbers behind it, for status displays/logging."""
+		with self._lock:
+			failures = sum(self._outcomes)
+			calls = len(self._outcomes)
+			retry_in = max(0.0, self.cooldown - (time.monotonic() - self._opened_at)) if self._state == OPEN else 0.0
+		return {
+			"state": self.state,
+			"recent_calls": calls,
+			"recent_failures": failures,
+			"retry_in": retry_in,
+		}
+
+	def allow(self) -> bool:
+		"""May a call go out now? Claims the probe slot when half-open."""
+		with self._lock:
+			if self._state == OPEN:
+				if time.monotonic() - self._opened_at < self.cooldown:
+					return False
+				self._state = HALF_OPEN
+			if self._state == HALF_OPEN:
+				if self._probe_in_flight:
+					return False
+				self._probe_in_flight = True
+			return True
+
+	def record_success(self) -> None:
+		with self._lock:
+			if self._state == HALF_OPEN:
+				self._state = CLOSED
+				self._outcomes.clear()
+				self._probe_in_flight = False
+			self._outcomes.append(False)
+
+	def record_failure(self) -> None:
+		with self._lock:
+			if self._state == HALF_OPEN:
+				self._trip()
+				return
+			self._outcomes.append(True)
+			calls = len(self._outcomes)
+			if calls >= self.min_calls and sum(self._outcomes) / calls >= self.failure_threshold:
+				self._trip()
+
+	def release(self) -> None:
+		"""
+		Give back a claimed probe slot without recording an outcome, for a
+		call that was abandoned (e.g. KeyboardInterrupt) rather than answered.
+		"""
+		with self._lock:
+			self._probe_in_flight = False
+
+	def _trip(self) -> None:
+		# Caller holds the lock.
+		self._state = OPEN
+		self._opened_at = time.monotonic()
+		self._probe_in_flight = False
+		self._outcomes.clear()
+
+
+class _Flight:
+	__slots__ = ("done", "result", "error")
+
+	def __init__(self) -> None:
+		self.done = threading.Event()
+		self.result: Any = None
+		self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+	"""
+	Coalesces concurrent calls with the same key: the first caller runs the
+	function, callers arriving while it is in flight wait and receive the
+	same result or exception. Nothing is remembered once the call finishes.
+	"""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._flights: Dict[Hashable, _Flight] = {}
+		self.coalesced = 0  # calls that shared another caller's flight
+
+	def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+		with self._lock:
+			flight = self._flights.get(key)
+			leader = flight is None
+			if leader:
+				flight = self._flights[key] = _Flight()
+			else:
+				self.coalesced += 1
+
+		if not leader:
+			flight.done.wait()
+			if flight.error is not None:
+				raise flight.error
+			return flight.result
+
+		try:
+			flight.result = fn()
+			return flight.result
+		except BaseException as e:
+			flight.error = e
+			raise
+		finally:
+			with self._lock:
+				del self._flights[key]
+			flight.done.set()
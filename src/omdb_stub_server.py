@@ -0,0 +1,231 @@
+"""
+Local stand-in for the OMDb API, for CI and load tests.
+
+Speaks the subset of the OMDB_BASE_URL contract the client uses:
+GET /?t=<title>&apikey=<key>&r=json, with {"Response": "False", "Error": ...}
+bodies for failures. Titles come from a fixture catalog (any storage file)
+and/or synthetic "Movie <n>" entries. Latency, rate limiting and 5xx errors
+can be injected.
+
+Run:
+    python -m src.omdb_stub_server --catalog storage/movies.csv --latency exp:30 --error-rate 0.02
+Point the client at it:
+    OMDB_BASE_URL=http://127.0.0.1:8765 OMDB_API_KEY=test python main.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from utils import normalize_title
+
+DEFAULT_PORT = 8765
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+	"""
+	Latency distribution from a spec in milliseconds; returns a sampler in seconds.
+	    "0" / "fixed:50"       constant
+	    "uniform:10:100"       uniform between bounds
+	    "exp:50"               exponential with the given mean
+	    "lognormal:50:0.5"     log-normal with the given median and sigma
+	"""
+	kind, _, rest = spec.partition(":")
+	if not rest:
+		kind, rest = "fixed", kind
+	args = [float(a) for a in rest.split(":")]
+	if kind == "fixed":
+		return lambda: args[0] / 1000
+	if kind == "uniform":
+		return lambda: random.uniform(args[0], args[1]) / 1000
+	if kind == "exp":
+		return lambda: random.expovariate(1 / args[0]) / 1000 if args[0] > 0 else 0.0
+	if kind == "lognormal":
+		mu, sigma = math.log(args[0]), args[1]
+		return lambda: random.lognormvariate(mu, sigma) / 1000
+	raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+def payload_from_record(title: str, record: Mapping) -> Dict[str, str]:
+	"""OMDb-shaped payload for a stored movie record."""
+	rating = record.get("rating")
+	return {
+		"Title": title,
+		"Year": str(record.get("year") or "N/A"),
+		"imdbRating": "N/A" if rating is None else f"{float(rating):.1f}",
+		"Poster": record.get("poster") or "N/A",
+		"Response": "True",
+	}
+
+
+def synthetic_catalog(count: int) -> Iterable[Tuple[str, Dict[str, str]]]:
+	for i in range(count):
+		title = f"Movie {i}"
+		yield title, {
+			"Title": title,
+			"Year": str(1950 + i % 75),
+			"imdbRating": f"{(i % 91) / 10 + 1:.1f}",
+			"Poster": "N/A",
+			"Response": "True",
+		}
+
+
+class OmdbStubServer:
+	"""
+	Threaded HTTP server imitating OMDb.
+
+	Args:
+		catalog:         (title, payload) pairs served for ?t= lookups.
+		api_key:         accepted key; None accepts any non-empty key.
+		latency:         sampler returning seconds to sleep per request.
+		error_rate:      probability of an HTTP 503 response.
+		rate_limit_rate: probability of a "Request limit reached!" answer.
+		daily_limit:     after this many requests every answer is a rate-limit error.
+	"""
+
+	def __init__(
+		self,
+		catalog: Iterable[Tuple[str, Dict[str, str]]],
+		*,
+		host: str = "127.0.0.1",
+		port: int = 0,
+		api_key: Optional[str] = None,
+		latency: Callable[[], float] = lambda: 0.0,
+		error_rate: float = 0.0,
+		rate_limit_rate: float = 0.0,
+		daily_limit: Optional[int] = None,
+	) -> None:
+		self.catalog = {normalize_title(title): payload for title, payload in catalog}
+		self.api_key = api_key
+		self.latency = latency
+		self.error_rate = error_rate
+		self.rate_limit_rate = rate_limit_rate
+		self.daily_limit = daily_limit
+		self.requests_served = 0
+		self._count_lock = threading.Lock()
+		self._thread: Optional[threading.Thread] = None
+		self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+		self._httpd.daemon_threads = True
+
+	@property
+	def base_url(self) -> str:
+		host, port = self._httpd.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def start(self) -> "OmdbStubServer":
+		"""Serve in a background thread."""
+		self._thread = threading.Thread(target=self._httpd.serve_forever, name="omdb-stub", daemon=True)
+		self._thread.start()
+		return self
+
+	def serve_forever(self) -> None:
+		self._httpd.serve_forever()
+
+	def stop(self) -> None:
+		self._httpd.shutdown()
+		self._httpd.server_close()
+
+	def __enter__(self) -> "OmdbStubServer":
+		return self.start()
+
+	def __exit__(self, *exc_info) -> None:
+		self.stop()
+
+	def respond(self, query: Dict[str, str]) -> Tuple[int, Dict[str, str]]:
+		"""(HTTP status, JSON body) for one request; the contract lives here."""
+		with self._count_lock:
+			self.requests_served += 1
+			served = self.requests_served
+		delay = self.latency()
+		if delay > 0:
+			time.sleep(delay)
+
+		key = query.get("apikey", "")
+		if not key:
+			return 401, {"Response": "False", "Error": "No API key provided."}
+		if self.api_key is not None and key != self.api_key:
+			return 401, {"Response": "False", "Error": "Invalid API key!"}
+		if (self.daily_limit is not None and served > self.daily_limit) or random.random() < self.rate_limit_rate:
+			return 401, {"Response": "False", "Error": "Request limit reached!"}
+		if random.random() < self.error_rate:
+			return 503, {"Response": "False", "Error": "Service Unavailable"}
+		title = query.get("t", "")
+		if not title:
+			return 200, {"Response": "False", "Error": "Incorrect IMDb ID."}
+		payload = self.catalog.get(normalize_title(title))
+		if payload is None:
+			return 200, {"Response": "False", "Error": "Movie not found!"}
+		return 200, payload
+
+	def _make_handler(self):
+		server = self
+
+		class Handler(BaseHTTPRequestHandler):
+			protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+			disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+			def do_GET(self) -> None:
+				query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+				status, body = server.respond(query)
+				data = json.dumps(body).encode("utf-8")
+				self.send_response(status)
+				self.send_header("Content-Type", "application/json; charset=utf-8")
+				self.send_header("Content-Length", str(len(data)))
+				self.end_headers()
+				self.wfile.write(data)
+
+			def log_message(self, *args) -> None:
+				pass  # keep load tests quiet
+
+		return Handler
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Local OMDb stand-in server.")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+	parser.add_argument("--catalog", default="storage/movies.csv", help="storage file used as fixture ('' for none)")
+	parser.add_argument("--synthetic", type=int, default=0, help="also serve 'Movie 0'..'Movie N-1'")
+	parser.add_argument("--api-key", help="only accept this key (default: any non-empty key)")
+	parser.add_argument("--latency", default="0", help="ms: fixed:N, uniform:A:B, exp:MEAN, lognormal:MEDIAN:SIGMA")
+	parser.add_argument("--error-rate", type=float, default=0.0, help="probability of HTTP 503")
+	parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="probability of a rate-limit answer")
+	parser.add_argument("--daily-limit", type=int, help="rate-limit every request after this many")
+	args = parser.parse_args()
+
+	catalog = list(synthetic_catalog(args.synthetic))
+	if args.catalog:
+		from storage.factory import open_storage
+
+		catalog.extend(
+			(title, payload_from_record(title, record))
+			for title, record in open_storage(args.catalog).iter_movies()
+		)
+
+	server = OmdbStubServer(
+		catalog,
+		host=args.host,
+		port=args.port,
+		api_key=args.api_key,
+		latency=parse_latency(args.latency),
+		error_rate=args.error_rate,
+		rate_limit_rate=args.rate_limit_rate,
+		daily_limit=args.daily_limit,
+	)
+	print(f"OMDb stub serving {len(server.catalog)} titles at {server.base_url} (Ctrl+C to stop)")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+
+
+if __name__ == "__main__":
+	main()
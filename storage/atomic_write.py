@@ -0,0 +1,188 @@
+"""
+atomic_write.py -- crash-safe file replacement shared by the file backends.
+
+A write never touches the live file: content goes to a temp file in the same
+directory which then replaces the target with os.replace(), so a crash leaves
+either the old or the new catalog on disk, never a truncated one.
+
+Durability modes:
+    DURABILITY_NONE  no fsync; fastest, a power loss may lose recent writes
+    DURABILITY_FILE  fsync the temp file before the rename (default)
+    DURABILITY_DIR   also fsync the directory, so the rename itself is durable
+
+With `group_commit` > 0, writes to the same file within that many seconds are
+coalesced: only the latest content is written, with a single fsync, from a
+background timer. flush() forces pending writes out (also run at exit).
+
+New files get the usual umask-based permissions; replaced files keep theirs.
+"""
+
+from __future__ import annotations
+
+import atexit
+import io
+import os
+import stat
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, TextIO
+
+DURABILITY_NONE = "none"
+DURABILITY_FILE = "file"
+DURABILITY_DIR = "dir"
+DURABILITY_MODES = (DURABILITY_NONE, DURABILITY_FILE, DURABILITY_DIR)
+
+WriteFn = Callable[[TextIO], None]
+
+# mkstemp creates files as 0600; new catalogs should get 0666 minus the umask
+# like any other file. The umask can only be read by setting it, so do it once.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+# Group-commit writers still alive at exit; flushed by one atexit hook, so
+# registering doesn't keep every writer alive forever.
+_GROUP_WRITERS: "weakref.WeakSet[AtomicWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    for writer in list(_GROUP_WRITERS):
+        writer.flush()
+
+
+def atomic_replace(path: str | Path, write_fn: WriteFn, durability: str = DURABILITY_FILE) -> None:
+    """
+    Stream content through `write_fn` into a temp file next to `path`, then
+    atomically replace `path` with it. Keeps the existing file's permissions
+    (a new file gets the umask-based default).
+    """
+    path = Path(path)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as tmp:
+            write_fn(tmp)
+            tmp.flush()
+            if durability != DURABILITY_NONE:
+                os.fsync(tmp.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = _NEW_FILE_MODE
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    if durability == DURABILITY_DIR:
+        _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows cannot open directories; nothing to sync
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class AtomicWriter:
+    """
+    Applies one durability policy to every write of a storage backend,
+    optionally batching frequent writes into one fsync (group commit).
+    """
+
+    def __init__(self, durability: str = DURABILITY_FILE, group_commit: float = 0.0) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, got {durability!r}")
+        self.durability = durability
+        self.group_commit = group_commit
+        # _lock guards the pending state and is never held during disk I/O;
+        # _io_lock serialises flushes so an older batch can't land after a newer one.
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: Dict[Path, tuple[str, Optional[Callable[[], None]]]] = {}
+        self._pending_fsync: Set[Path] = set()
+        self._in_flight: Set[Path] = set()
+        self._timer: Optional[threading.Timer] = None
+        if group_commit > 0:
+            _GROUP_WRITERS.add(self)
+
+    def write(self, path: str | Path, write_fn: WriteFn, on_commit: Optional[Callable[[], None]] = None) -> None:
+        """
+        Replace `path` with the content produced by `write_fn`. In group-commit
+        mode the content is rendered now and written later; `on_commit` runs
+        once it is on disk.
+        """
+        path = Path(path)
+        if self.group_commit <= 0:
+            atomic_replace(path, write_fn, self.durability)
+            if on_commit:
+                on_commit()
+            return
+        buffer = io.StringIO(newline="")
+        write_fn(buffer)
+        with self._lock:
+            self._pending[path] = (buffer.getvalue(), on_commit)
+            self._schedule()
+
+    def append(self, path: str | Path, write_fn: WriteFn) -> None:
+        """
+        Append in place (not atomic, but never truncates existing content).
+        The fsync is deferred in group-commit mode.
+        """
+        path = Path(path)
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            write_fn(f)
+            f.flush()
+            if self.durability == DURABILITY_NONE:
+                return
+            if self.group_commit <= 0:
+                os.fsync(f.fileno())
+                return
+        with self._lock:
+            self._pending_fsync.add(path)
+            self._schedule()
+
+    def pending(self, path: str | Path) -> bool:
+        """True while a replacement of `path` is waiting for (or in) the group commit."""
+        path = Path(path)
+        with self._lock:
+            return path in self._pending or path in self._in_flight
+
+    def flush(self) -> None:
+        """Write out everything that is waiting for a group commit."""
+        with self._io_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+                pending_fsync, self._pending_fsync = self._pending_fsync, set()
+                self._in_flight = set(pending)
+            try:
+                for path in pending_fsync - pending.keys():
+                    with open(path, "a", encoding="utf-8") as f:
+                        os.fsync(f.fileno())
+                for path, (text, on_commit) in pending.items():
+                    atomic_replace(path, lambda f, text=text: f.write(text), self.durability)
+                    if on_commit:
+                        on_commit()
+            finally:
+                with self._lock:
+                    self._in_flight = set()
+
+    def _schedule(self) -> None:
+        # Caller holds the lock.
+        if self._timer is None:
+            self._timer = threading.Timer(self.group_commit, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
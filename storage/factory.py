@@ -0,0 +1,24 @@
+# factory.py
+from __future__ import annotations
+
+from pathlib import Path
+
+from istorage import IStorage
+from storage.storage_csv import StorageCsv
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+
+def open_storage(path: str | Path) -> IStorage:
+    """
+    Pick the backend from the file extension:
+        .csv -> StorageCsv, .json -> StorageJson, .sqlite3/.sqlite/.db -> StorageSqlite
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return StorageCsv(str(path))
+    if suffix == ".json":
+        return StorageJson(path)
+    if suffix in (".sqlite3", ".sqlite", ".db"):
+        return StorageSqlite(path)
+    raise ValueError(f"Unsupported storage file type: {path} (use .csv, .json or .sqlite3)")
@@ -0,0 +1,89 @@
+"""
+movie.py -- compact record type returned by the storage backends.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+
+def year_start_of(year: Any) -> Optional[int]:
+    """
+    First 4-digit year of an OMDb/CSV year string, when there is one.
+
+    Examples:
+        "1997" -> 1997
+        "2015–2019" -> 2015
+        "1997/II" -> 1997
+        None, "", invalid -> None
+    """
+    s = str(year or "").strip()
+    return int(s[:4]) if len(s) >= 4 and s[:4].isdigit() else None
+
+
+class Movie(Mapping):
+    """
+    One stored movie, held in __slots__ instead of a per-record dict.
+
+    Attributes:
+        title:      str
+        year_start: int | None    parsed from year_raw (see year_start_of)
+        year_raw:   str | None    year text as stored ("1997", "2021–2025", ...)
+        rating:     float | None
+        poster:     str | None
+
+    For compatibility it is also a read-only Mapping with the keys the old
+    record dicts had ("year", "rating", "poster"), so record.get("rating")
+    and record["year"] keep working. Treat instances as immutable: use
+    with_rating() to change the rating.
+    """
+
+    __slots__ = ("title", "year_start", "year_raw", "rating", "poster")
+
+    _KEYS = ("year", "rating", "poster")
+
+    def __init__(
+        self,
+        title: str,
+        year_raw: Optional[str],
+        rating: Optional[float],
+        poster: Optional[str],
+        year_start: Optional[int] = None,
+    ) -> None:
+        self.title = title
+        self.year_raw = year_raw
+        self.rating = rating
+        self.poster = poster
+        self.year_start = year_start if year_start is not None else year_start_of(year_raw)
+
+    # ----- Mapping compatibility -----
+    def __getitem__(self, key: str) -> Any:
+        if key == "year":
+            return self.year_raw
+        if key == "rating":
+            return self.rating
+        if key == "poster":
+            return self.poster
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return (
+            f"Movie(title={self.title!r}, year_raw={self.year_raw!r}, "
+            f"rating={self.rating!r}, poster={self.poster!r})"
+        )
+
+    # ----- Helpers -----
+    def with_rating(self, rating: Optional[float]) -> "Movie":
+        """Return a copy with a different rating."""
+        return Movie(self.title, self.year_raw, rating, self.poster, self.year_start)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The legacy record dict ({"year", "rating", "poster"}), e.g. for JSON."""
+        return {"year": self.year_raw, "rating": self.rating, "poster": self.poster}
@@ -3,9 +3,12 @@ from __future__ import annotations
 
 import csv
 import os
-from typing import Dict, Any, List, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from istorage import IStorage
+from istorage import IStorage, MovieRow, ADDED, DELETED, DUPLICATE, NOT_FOUND, UPDATED
+from storage.atomic_write import AtomicWriter, DURABILITY_FILE, atomic_replace
+from storage.movie import Movie
 
 
 class StorageCsv(IStorage):
@@ -20,80 +23,223 @@ class StorageCsv(IStorage):
     - year:   str           (can be "1997", "2021–2025", "1997/II", etc.)
     - poster: str | None    (empty cell means None)
 
-    All public methods satisfy IStorage.
+    All public methods satisfy IStorage. Records are returned as compact
+    Movie objects (read-only Mappings with "year"/"rating"/"poster").
+
+    If the file holds several rows for one title (case-insensitive), the
+    last one wins. The rows it shadows, and rows without a title, are not
+    served but are kept through rewrites (written ahead of the live rows,
+    so the same row still wins on the next read); deleting the title
+    removes them too.
+
+    Rewrites replace the file atomically and adds are appended (see
+    storage.atomic_write for the `durability` modes and `group_commit`).
     """
 
     FIELDNAMES = ["title", "rating", "year", "poster"]
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, *, durability: str = DURABILITY_FILE, group_commit: float = 0.0) -> None:
         self.filepath = filepath
+        self._writer = AtomicWriter(durability, group_commit)
+        # casefolded title -> Movie, in file order; rebuilt only when the file
+        # changes on disk, otherwise kept up to date by each write.
+        self._rows: Dict[str, Movie] | None = None
+        # Raw rows the index doesn't serve (blank or shadowed titles).
+        self._shadowed: List[Dict[str, str]] = []
+        self._stamp: Tuple[int, int] | None = None
+        self._tx_depth = 0
+        self._tx_dirty = False
+        self._version = 0
         self._ensure_file()
 
     # ------------- IStorage API -------------
 
-    def list_movies(self) -> Dict[str, Dict[str, Any]]:
+    def list_movies(self) -> Dict[str, Movie]:
         """
-        Returns a dictionary-of-dictionaries keyed by title.
+        Returns the movies keyed by title.
         Example:
             {
-              "Titanic": {"rating": 9.2, "year": "1997", "poster": "..."},
+              "Titanic": Movie(title="Titanic", year_raw="1997", rating=9.2, poster="..."),
               ...
             }
         """
-        result: Dict[str, Dict[str, Any]] = {}
-        for row in self._read_all():
-            title = (row.get("title") or "").strip()
-            if not title:
-                continue
-            result[title] = {
-                "rating": self._to_float(row.get("rating")),  # float | None
-                "year": (row.get("year") or "").strip() or None,  # str | None
-                "poster": self._none_if_blank(row.get("poster")),  # str | None
-            }
-        return result
+        return {movie.title: movie for movie in self._load().values()}
+
+    def version(self) -> int:
+        """Bumped on every mutation and every re-read of the file."""
+        self._load()
+        return self._version
+
+    def location(self) -> str:
+        return os.path.abspath(self.filepath)
+
+    def iter_movies(self) -> Iterator[Tuple[str, Movie]]:
+        """
+        Stream (title, record) pairs. Served from the in-memory index when it
+        is current, otherwise straight from the CSV reader without caching
+        (a title stored in several rows is then yielded once per row).
+        """
+        if self._rows is not None and (
+            self._tx_depth or self._writer.pending(self.filepath) or self._file_stamp() == self._stamp
+        ):
+            for movie in self._rows.values():
+                yield movie.title, movie
+            return
+        for row in self._stream_rows():
+            movie = self._to_movie(row)
+            if movie is not None:
+                yield movie.title, movie
 
     def add_movie(self, title: str, year: str, rating: float | None, poster: str | None) -> None:
         """
         Add a new movie; raise ValueError if movie title already exists (case-insensitive).
         """
-        rows = self._read_all()
-        if self._find_index_by_title(rows, title) is not None:
+        rows = self._load()
+        key = title.casefold()
+        if key in rows:
             raise ValueError(f'Movie "{title}" already exists.')
 
-        rows.append({
-            "title": title,
-            # store empty string for None to keep CSV clean
-            "rating": "" if rating is None else f"{float(rating)}",
-            # keep year as-is (string) to support ranges/suffixes
-            "year": "" if year is None else str(year),
-            "poster": poster or "",
-        })
-        self._write_all(rows)
+        self._commit_added({key: self._make_movie(title, year, rating, poster)})
 
     def delete_movie(self, title: str) -> None:
         """
         Delete a movie by title; raise KeyError if not found.
         """
-        rows = self._read_all()
-        idx = self._find_index_by_title(rows, title)
-        if idx is None:
+        rows = self._staged()
+        key = title.casefold()
+        if key not in rows:
             raise KeyError(f'Movie "{title}" not found.')
-        del rows[idx]
-        self._write_all(rows)
+        del rows[key]
+        self._commit(rows, self._without_shadowed({key}))
 
     def update_movie(self, title: str, rating: float | None) -> None:
         """
         Update rating of a movie by title; raise KeyError if not found.
         """
-        rows = self._read_all()
-        idx = self._find_index_by_title(rows, title)
-        if idx is None:
+        rows = self._staged()
+        key = title.casefold()
+        if key not in rows:
             raise KeyError(f'Movie "{title}" not found.')
-        rows[idx]["rating"] = "" if rating is None else f"{float(rating)}"
-        self._write_all(rows)
+        rows[key] = rows[key].with_rating(None if rating is None else float(rating))
+        self._commit(rows, self._shadowed)
+
+    def flush(self) -> None:
+        """Force out writes still waiting for a group commit."""
+        self._writer.flush()
+
+    @contextmanager
+    def transaction(self) -> Iterator["StorageCsv"]:
+        """
+        Buffer mutations in memory and rewrite the file once on exit.
+        If the block raises, the buffered changes are discarded.
+        """
+        rows = self._load()
+        if self._tx_depth == 0:
+            # Movies are replaced, never mutated, so a shallow copy is a full snapshot.
+            snapshot = dict(rows)
+            shadowed_snapshot = list(self._shadowed)
+            self._tx_dirty = False
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self._rows = snapshot
+                self._shadowed = shadowed_snapshot
+                self._version += 1
+                self._tx_dirty = False
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0 and self._tx_dirty:
+            self._tx_dirty = False
+            try:
+                self._write_all(self._rows, self._shadowed)
+            except BaseException:
+                # Nothing reached the disk: drop the buffered changes too.
+                self._rows = snapshot
+                self._shadowed = shadowed_snapshot
+                self._version += 1
+                raise
+
+    # ------------- Batch API (one read, one write) -------------
+
+    def add_many(self, movies: Iterable[MovieRow]) -> List[Tuple[str, str]]:
+        """
+        Add several movies with a single append; duplicates (case-insensitive,
+        including repeats within the batch) are reported as DUPLICATE.
+        """
+        rows = self._load()
+        new_rows: Dict[str, Movie] = {}
+        results = []
+        for title, year, rating, poster in movies:
+            key = title.casefold()
+            if key in rows or key in new_rows:
+                results.append((title, DUPLICATE))
+                continue
+            new_rows[key] = self._make_movie(title, year, rating, poster)
+            results.append((title, ADDED))
+        if new_rows:
+            self._commit_added(new_rows)
+        return results
+
+    def update_many(self, ratings: Iterable[Tuple[str, float | None]]) -> List[Tuple[str, str]]:
+        """
+        Update several ratings with a single rewrite.
+        """
+        rows = self._staged()
+        results = []
+        for title, rating in ratings:
+            key = title.casefold()
+            if key not in rows:
+                results.append((title, NOT_FOUND))
+                continue
+            rows[key] = rows[key].with_rating(None if rating is None else float(rating))
+            results.append((title, UPDATED))
+        if any(status == UPDATED for _, status in results):
+            self._commit(rows, self._shadowed)
+        return results
+
+    def delete_many(self, titles: Iterable[str]) -> List[Tuple[str, str]]:
+        """
+        Delete several movies with a single rewrite.
+        """
+        rows = self._staged()
+        results = []
+        deleted = set()
+        for title in titles:
+            key = title.casefold()
+            if rows.pop(key, None) is None:
+                results.append((title, NOT_FOUND))
+            else:
+                deleted.add(key)
+                results.append((title, DELETED))
+        if deleted:
+            self._commit(rows, self._without_shadowed(deleted))
+        return results
 
     # ------------- Internals -------------
 
+    @staticmethod
+    def _make_movie(title: str, year: str | None, rating: float | None, poster: str | None) -> Movie:
+        return Movie(
+            title,
+            # keep year as text to support ranges/suffixes
+            None if year is None else (str(year).strip() or None),
+            None if rating is None else float(rating),
+            poster or None,
+        )
+
+    @staticmethod
+    def _to_row(movie: Movie) -> Dict[str, str]:
+        # store empty strings for None to keep CSV clean
+        return {
+            "title": movie.title,
+            "rating": "" if movie.rating is None else f"{movie.rating}",
+            "year": movie.year_raw or "",
+            "poster": movie.poster or "",
+        }
+
     def _ensure_file(self) -> None:
         """
         Make sure the CSV exists and has the correct header.
@@ -119,33 +265,155 @@ class StorageCsv(IStorage):
                 needs_header = True
 
         if needs_header:
-            with open(self.filepath, "w", encoding="utf-8", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
-                writer.writeheader()
+            atomic_replace(
+                self.filepath,
+                lambda f: csv.DictWriter(f, fieldnames=self.FIELDNAMES).writeheader(),
+                self._writer.durability,
+            )
+
+    def _stream_rows(self) -> Iterator[Dict[str, str]]:
+        with open(self.filepath, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or any(fn not in (reader.fieldnames or []) for fn in self.FIELDNAMES):
+                return
+            yield from reader
 
     def _read_all(self) -> List[Dict[str, str]]:
         with open(self.filepath, "r", encoding="utf-8", newline="") as f:
             reader = csv.DictReader(f)
-            # If header wrong/missing, fix and reopen.
+            # If header wrong/missing, reset the file to a bare header.
             if reader.fieldnames is None or any(fn not in (reader.fieldnames or []) for fn in self.FIELDNAMES):
                 self._ensure_file()
-                f.seek(0)
-                reader = csv.DictReader(f)
+                return []
             return [dict(row) for row in reader]
 
-    def _write_all(self, rows: List[Dict[str, str]]) -> None:
-        with open(self.filepath, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
+    def _write_all(self, rows: Dict[str, Movie], shadowed: List[Dict[str, str]]) -> None:
+        def write_csv(f) -> None:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES, extrasaction="ignore")
             writer.writeheader()
-            writer.writerows(rows)
+            writer.writerows(shadowed)
+            writer.writerows(self._to_row(movie) for movie in rows.values())
 
-    @staticmethod
-    def _find_index_by_title(rows: List[Dict[str, str]], title: str) -> Optional[int]:
-        target = title.casefold()
-        for i, row in enumerate(rows):
-            if (row.get("title") or "").casefold() == target:
-                return i
-        return None
+        self._writer.write(self.filepath, write_csv, on_commit=self._refresh_stamp)
+
+    def _without_shadowed(self, keys: set) -> List[Dict[str, str]]:
+        """Shadowed rows minus those of deleted titles, so they don't come back."""
+        return [row for row in self._shadowed if (row.get("title") or "").strip().casefold() not in keys]
+
+    def _refresh_stamp(self) -> None:
+        self._stamp = self._file_stamp()
+
+    def _staged(self) -> Dict[str, Movie]:
+        """
+        The index a rewriting mutation should edit: the live one inside a
+        transaction (rolled back if the block raises), otherwise a copy that
+        _commit() adopts only once it is on disk.
+        """
+        rows = self._load()
+        return rows if self._tx_depth else dict(rows)
+
+    def _commit(self, rows: Dict[str, Movie], shadowed: List[Dict[str, str]]) -> None:
+        """
+        Rewrite the file from a staged index, then adopt it; a failed write
+        leaves the cache matching the disk. In a transaction, defer the write.
+        """
+        if not self._tx_depth:
+            self._write_all(rows, shadowed)
+        else:
+            self._tx_dirty = True
+        self._rows, self._shadowed = rows, shadowed
+        self._version += 1
+
+    def _commit_added(self, added: Dict[str, Movie]) -> None:
+        """
+        Persist new rows (keyed by casefolded title), then add them to the index.
+        Adding never touches existing rows, so they are appended, not rewritten.
+        """
+        rows = self._rows
+        if self._tx_depth:
+            self._tx_dirty = True
+        elif self._writer.pending(self.filepath):
+            # A pending group-commit rewrite would clobber an append, so rewrite instead.
+            self._write_all({**rows, **added}, self._shadowed)
+        else:
+            try:
+                self._append_rows(added.values())
+            except BaseException:
+                self._rows = None  # part of the rows may have landed: re-read the file next time
+                raise
+        rows.update(added)
+        self._version += 1
+
+    def _append_rows(self, movies: Iterable[Movie]) -> None:
+        # _ensure_file accepts the columns in any order (and extra ones), so
+        # write each value under the file's own header, not FIELDNAMES order.
+        with open(self.filepath, "r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f), None) or self.FIELDNAMES
+        needs_newline = False
+        with open(self.filepath, "rb") as f:
+            # A hand-edited file may lack the trailing newline; don't glue rows together.
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                f.seek(size - 1)
+                needs_newline = f.read(1) not in (b"\n", b"\r")
+
+        def write_rows(f) -> None:
+            if needs_newline:
+                f.write("\r\n")
+            csv.DictWriter(f, fieldnames=header).writerows(self._to_row(movie) for movie in movies)
+
+        self._writer.append(self.filepath, write_rows)
+        self._refresh_stamp()
+
+    def _load(self) -> Dict[str, Movie]:
+        """
+        Return the title index (casefolded title -> Movie), re-reading the file
+        only if its (st_mtime_ns, st_size) stamp changed since the last read/write.
+        """
+        if self._rows is not None and (self._tx_depth or self._writer.pending(self.filepath)):
+            # Never swap the index under buffered, unflushed changes.
+            return self._rows
+        stamp = self._file_stamp()
+        if self._rows is None or stamp != self._stamp:
+            rows: Dict[str, Movie] = {}
+            raw: Dict[str, Dict[str, str]] = {}
+            shadowed: List[Dict[str, str]] = []
+            for row in self._read_all():
+                movie = self._to_movie(row)
+                if movie is None:
+                    shadowed.append(row)
+                    continue
+                key = movie.title.casefold()
+                if key in raw:
+                    # Last occurrence wins, as list_movies() always did.
+                    shadowed.append(raw[key])
+                rows[key] = movie
+                raw[key] = row
+            self._rows = rows
+            self._shadowed = shadowed
+            self._stamp = stamp
+            self._version += 1
+        return self._rows
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @classmethod
+    def _to_movie(cls, row: Dict[str, str]) -> Optional[Movie]:
+        """Parse a CSV row; rows without a title are skipped (None)."""
+        title = (row.get("title") or "").strip()
+        if not title:
+            return None
+        return Movie(
+            title,
+            (row.get("year") or "").strip() or None,  # str | None
+            cls._to_float(row.get("rating")),  # float | None
+            cls._none_if_blank(row.get("poster")),  # str | None
+        )
 
     @staticmethod
     def _to_int(value: Optional[str]) -> Optional[int]:
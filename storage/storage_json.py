@@ -1,9 +1,73 @@
 """JSON implementation of IStorage"""
 
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any
-from istorage import IStorage
+from typing import Dict, Any, Iterable, Iterator, List, TextIO, Tuple
+from istorage import IStorage, MovieRow, ADDED, DELETED, DUPLICATE, NOT_FOUND, UPDATED
+from storage.atomic_write import AtomicWriter, DURABILITY_FILE
+from storage.movie import Movie
+
+_DECODER = json.JSONDecoder()
+_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_json_object(f: TextIO) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a top-level JSON object, yielding (key, value) pairs
+    while holding only one chunk and the current value in memory.
+    """
+    buf, pos, eof = "", 0, False
+
+    def read_more() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(_CHUNK_SIZE)
+        buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+        return bool(chunk)
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not read_more():
+                raise ValueError("Unexpected end of storage JSON")
+
+    def decode() -> Any:
+        nonlocal pos
+        next_char()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(buf, pos)
+                # A value ending at the chunk edge may be cut short (e.g. a number).
+                if end < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            read_more()
+
+    if next_char() != "{":
+        raise ValueError("Root of storage JSON must be a dict")
+    pos += 1
+    if next_char() == "}":
+        return
+    while True:
+        key = decode()
+        if next_char() != ":":
+            raise ValueError("Malformed storage JSON: expected ':'")
+        pos += 1
+        yield key, decode()
+        sep = next_char()
+        pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError("Malformed storage JSON: expected ',' or '}'")
+
 
 class StorageJson(IStorage):
     """
@@ -13,64 +77,250 @@ class StorageJson(IStorage):
     {
       "Movie Title": {"year": "1997", "rating": 8.5, "poster": null}
     }
+
+    The parsed file is kept in memory and validated against the file's
+    (st_mtime_ns, st_size) stamp, so it is only re-parsed when another
+    process has changed it. Writes update the snapshot in place. Records are
+    held as compact Movie objects (read-only Mappings).
+
+    Writes replace the file atomically (see storage.atomic_write for the
+    `durability` modes and `group_commit` batching).
     """
 
-    def __init__(self, file_path: str | Path) -> None:
+    def __init__(
+        self,
+        file_path: str | Path,
+        *,
+        durability: str = DURABILITY_FILE,
+        group_commit: float = 0.0,
+    ) -> None:
         self._path = Path(file_path)
+        self._writer = AtomicWriter(durability, group_commit)
+        self._movies: Dict[str, Movie] = {}
+        self._loaded = False
+        self._stamp: Tuple[int, int] | None = None
+        self._tx_depth = 0
+        self._tx_dirty = False
+        self._version = 0
         if not self._path.exists():
             self._write({})
         else:
             try:
-                data = self._read()
-                if not isinstance(data, dict):
-                    # Reset if root isn't a dict
-                    self._write({})
-            except json.JSONDecodeError:
+                self._load()
+            except ValueError:
+                # Reset if the file is not valid JSON or its root isn't a dict
                 self._write({})
+        # The file must exist on disk right away, even in group-commit mode.
+        self._writer.flush()
 
     # --------- helpers ---------
-    def _read(self) -> Dict[str, Dict[str, Any]]:
+    def _read(self) -> Dict[str, Movie]:
         with self._path.open("r", encoding="utf-8") as f:
             data = json.load(f)
         if not isinstance(data, dict):
             # Use ValueError here: JSONDecodeError is meant for parsing failures
             raise ValueError("Root of storage JSON must be a dict")
-        # Migration guard: ensure each record has the poster key
-        for rec in data.values():
-            if "poster" not in rec:
-                rec["poster"] = None
-        return data
+        return {title: self._to_movie(title, rec) for title, rec in data.items()}
+
+    @staticmethod
+    def _to_movie(title: str, rec: Dict[str, Any]) -> Movie:
+        # .get() doubles as the migration guard for records without a poster key
+        year = rec.get("year")
+        return Movie(title, None if year is None else str(year), rec.get("rating"), rec.get("poster"))
+
+    def _write(self, movies: Dict[str, Movie]) -> None:
+        """Write `movies` and only then adopt it as the cache (a failed write changes nothing)."""
+        self._writer.write(
+            self._path,
+            lambda f: json.dump(movies, f, indent=2, ensure_ascii=False, default=Movie.to_dict),
+            on_commit=self._refresh_stamp,
+        )
+        if movies is not self._movies:
+            self._set_cache(movies)
+
+    def _refresh_stamp(self) -> None:
+        self._stamp = self._file_stamp()
+
+    def _file_stamp(self) -> Tuple[int, int] | None:
+        try:
+            st = self._path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self) -> Dict[str, Movie]:
+        """
+        Return the cached snapshot, re-parsing only if the file changed on disk.
+        """
+        if self._loaded and (self._tx_depth or self._writer.pending(self._path)):
+            # Never swap the snapshot under buffered, unflushed changes.
+            return self._movies
+        stamp = self._file_stamp()
+        if not self._loaded or stamp != self._stamp:
+            self._set_cache(self._read())
+            self._stamp = stamp
+        return self._movies
+
+    def _staged(self) -> Dict[str, Movie]:
+        """
+        The dict a mutation should edit: the cache itself inside a transaction
+        (rolled back if the block raises), otherwise a copy that _commit()
+        adopts only once it is on disk.
+        """
+        movies = self._load()
+        return movies if self._tx_depth else dict(movies)
 
-    def _write(self, data: Dict[str, Dict[str, Any]]) -> None:
-        with self._path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def _commit(self, movies: Dict[str, Movie]) -> None:
+        """Write a staged dict now, or defer to the end of the enclosing transaction."""
+        if self._tx_depth:
+            self._version += 1
+            self._tx_dirty = True
+        else:
+            self._write(movies)
+
+    def _set_cache(self, movies: Dict[str, Movie]) -> None:
+        self._movies = movies
+        self._loaded = True
+        self._version += 1
 
     # --------- IStorage API ---------
-    def list_movies(self) -> Dict[str, Dict[str, Any]]:
-        return self._read()
+    def list_movies(self) -> Dict[str, Movie]:
+        """
+        Return all movies keyed by title.
+
+        A fresh dict (a shallow copy of the cached snapshot), so callers may
+        add or delete while iterating it.
+        """
+        return dict(self._load())
+
+    def version(self) -> int:
+        """Bumped on every mutation and every re-read of the file."""
+        self._load()
+        return self._version
+
+    def location(self) -> str:
+        return str(self._path.resolve())
+
+    def iter_movies(self) -> Iterator[Tuple[str, Movie]]:
+        """
+        Stream (title, record) pairs. Served from the snapshot when it is
+        current, otherwise parsed incrementally from the file without caching.
+        """
+        if self._loaded and (
+            self._tx_depth or self._writer.pending(self._path) or self._file_stamp() == self._stamp
+        ):
+            yield from self._movies.items()
+            return
+        with self._path.open("r", encoding="utf-8") as f:
+            for title, rec in _iter_json_object(f):
+                yield title, self._to_movie(title, rec)
 
     def add_movie(self, title: str, year: str | int, rating: float | None, poster: str | None) -> None:
         """
         Persist a movie record exactly as provided by the caller.
         """
-        data = self._read()
-        data[title] = {"year": str(year) if year is None else None, "rating": rating, "poster": poster}
-        self._write(data)
+        movies = self._staged()
+        movies[title] = Movie(title, None if year is None else str(year), rating, poster)
+        self._commit(movies)
 
     def delete_movie(self, title: str) -> None:
         """
         Remove a movie by exact title key, if present.
         """
-        data = self._read()
-        if title in data:
-            del data[title]
-            self._write(data)
+        movies = self._staged()
+        if title in movies:
+            del movies[title]
+            self._commit(movies)
 
     def update_movie(self, title: str, rating: float | None) -> None:
         """
         Update only the rating of an existing movie, if present.
         """
-        data = self._read()
-        if title in data:
-            data[title]["rating"] = rating
-            self._write(data)
+        movies = self._staged()
+        if title in movies:
+            movies[title] = movies[title].with_rating(rating)
+            self._commit(movies)
+
+    def flush(self) -> None:
+        """Force out writes still waiting for a group commit."""
+        self._writer.flush()
+
+    @contextmanager
+    def transaction(self) -> Iterator["StorageJson"]:
+        """
+        Buffer mutations in memory and write the file once on exit.
+        If the block raises, the buffered changes are discarded.
+        """
+        movies = self._load()
+        if self._tx_depth == 0:
+            # Movies are replaced, never mutated, so a shallow copy is a full snapshot.
+            snapshot = dict(movies)
+            self._tx_dirty = False
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self._set_cache(snapshot)
+                self._tx_dirty = False
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0 and self._tx_dirty:
+            self._tx_dirty = False
+            try:
+                self._write(self._movies)
+            except BaseException:
+                # Nothing reached the disk: drop the buffered changes too.
+                self._set_cache(snapshot)
+                raise
+
+    # --------- Batch API (one read, one write) ---------
+    def add_many(self, movies: Iterable[MovieRow]) -> List[Tuple[str, str]]:
+        """
+        Add several movies with a single write. Existing titles are left
+        untouched and reported as DUPLICATE.
+        """
+        stored = self._staged()
+        results = []
+        for title, year, rating, poster in movies:
+            if title in stored:
+                results.append((title, DUPLICATE))
+                continue
+            stored[title] = Movie(title, None if year is None else str(year), rating, poster)
+            results.append((title, ADDED))
+        if any(status == ADDED for _, status in results):
+            self._commit(stored)
+        return results
+
+    def update_many(self, ratings: Iterable[Tuple[str, float | None]]) -> List[Tuple[str, str]]:
+        """
+        Update several ratings with a single write.
+        """
+        movies = self._staged()
+        results = []
+        for title, rating in ratings:
+            if title in movies:
+                movies[title] = movies[title].with_rating(rating)
+                results.append((title, UPDATED))
+            else:
+                results.append((title, NOT_FOUND))
+        if any(status == UPDATED for _, status in results):
+            self._commit(movies)
+        return results
+
+    def delete_many(self, titles: Iterable[str]) -> List[Tuple[str, str]]:
+        """
+        Delete several movies by exact title key with a single write.
+        """
+        movies = self._staged()
+        results = []
+        for title in titles:
+            if title in movies:
+                del movies[title]
+                results.append((title, DELETED))
+            else:
+                results.append((title, NOT_FOUND))
+        if any(status == DELETED for _, status in results):
+            self._commit(movies)
+        return results
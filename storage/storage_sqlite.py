@@ -0,0 +1,212 @@
+# storage_sqlite.py
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, ContextManager, Iterable, Iterator, List, Tuple
+
+from istorage import IStorage, MovieRow, ADDED, DELETED, DUPLICATE, NOT_FOUND, UPDATED
+from storage.atomic_write import DURABILITY_DIR, DURABILITY_FILE, DURABILITY_NONE
+from storage.movie import Movie, year_start_of
+
+
+class StorageSqlite(IStorage):
+    """
+    SQLite-based storage for movies.
+
+    Table schema:
+        movies(title, title_key, year, year_start, rating, poster)
+
+    - title:      str (unique, case-insensitive via title_key)
+    - title_key:  str           casefolded title, UNIQUE index
+    - year:       str | None    raw year text ("1997", "2021–2025", "1997/II", ...)
+    - year_start: int | None    first 4-digit year, indexed for range queries
+    - rating:     float | None  indexed for sorting/filtering
+    - poster:     str | None
+
+    The database runs in WAL mode, so every single-record mutation is an
+    indexed O(log n) operation instead of a full file rewrite. Behavior matches
+    StorageCsv: duplicates raise ValueError, missing titles raise KeyError.
+
+    `durability` takes the same modes as the file backends and maps them onto
+    PRAGMA synchronous: "file" is FULL, which in WAL mode syncs the log on
+    every commit (NORMAL only syncs at checkpoints, so a power loss could drop
+    committed writes); "dir" is EXTRA; "none" is OFF.
+    """
+
+    _SYNCHRONOUS = {DURABILITY_NONE: "OFF", DURABILITY_FILE: "FULL", DURABILITY_DIR: "EXTRA"}
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS movies (
+            title      TEXT NOT NULL,
+            title_key  TEXT NOT NULL,
+            year       TEXT,
+            year_start INTEGER,
+            rating     REAL,
+            poster     TEXT
+        )
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_movies_title_key ON movies (title_key)",
+        "CREATE INDEX IF NOT EXISTS idx_movies_year_start ON movies (year_start)",
+        "CREATE INDEX IF NOT EXISTS idx_movies_rating ON movies (rating)",
+    )
+
+    # Constant SQL strings: sqlite3 keeps them in its prepared statement cache.
+    _SQL_LIST = "SELECT title, year, rating, poster, year_start FROM movies ORDER BY rowid"
+    # Only a clash on title_key is a duplicate; any other constraint violation
+    # still raises sqlite3.IntegrityError (OR IGNORE would swallow it too).
+    _SQL_INSERT = (
+        "INSERT INTO movies (title, title_key, year, year_start, rating, poster) "
+        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (title_key) DO NOTHING"
+    )
+    _SQL_DELETE = "DELETE FROM movies WHERE title_key = ?"
+    _SQL_UPDATE_RATING = "UPDATE movies SET rating = ? WHERE title_key = ?"
+
+    def __init__(self, file_path: str | Path, *, durability: str = DURABILITY_FILE) -> None:
+        if durability not in self._SYNCHRONOUS:
+            raise ValueError(f"durability must be one of {tuple(self._SYNCHRONOUS)}, got {durability!r}")
+        self._path = Path(file_path)
+        self._conn = sqlite3.connect(self._path, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={self._SYNCHRONOUS[durability]}")
+        self._tx_depth = 0
+        with self._atomic():
+            for statement in self._SCHEMA:
+                self._conn.execute(statement)
+
+    # ------------- IStorage API -------------
+
+    def list_movies(self) -> Dict[str, Movie]:
+        """
+        Returns the movies keyed by title, in insertion order.
+        """
+        return dict(self.iter_movies())
+
+    def version(self) -> Tuple[int, int]:
+        """
+        (changes made through this connection, PRAGMA data_version); the
+        latter moves whenever another connection commits.
+        """
+        (data_version,) = self._conn.execute("PRAGMA data_version").fetchone()
+        return self._conn.total_changes, data_version
+
+    def location(self) -> str:
+        return str(self._path.resolve())
+
+    def iter_movies(self) -> Iterator[Tuple[str, Movie]]:
+        """
+        Stream (title, record) pairs straight from the cursor.
+        """
+        for title, year, rating, poster, year_start in self._conn.execute(self._SQL_LIST):
+            yield title, Movie(title, year, rating, poster, year_start)
+
+    def add_movie(self, title: str, year: str, rating: float | None, poster: str | None) -> None:
+        """
+        Add a new movie; raise ValueError if movie title already exists (case-insensitive).
+        """
+        with self._atomic():
+            cursor = self._conn.execute(self._SQL_INSERT, self._insert_params(title, year, rating, poster))
+        if cursor.rowcount == 0:
+            raise ValueError(f'Movie "{title}" already exists.')
+
+    def delete_movie(self, title: str) -> None:
+        """
+        Delete a movie by title; raise KeyError if not found.
+        """
+        with self._atomic():
+            cursor = self._conn.execute(self._SQL_DELETE, (title.casefold(),))
+        if cursor.rowcount == 0:
+            raise KeyError(f'Movie "{title}" not found.')
+
+    def update_movie(self, title: str, rating: float | None) -> None:
+        """
+        Update rating of a movie by title; raise KeyError if not found.
+        """
+        with self._atomic():
+            cursor = self._conn.execute(
+                self._SQL_UPDATE_RATING,
+                (None if rating is None else float(rating), title.casefold()),
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(f'Movie "{title}" not found.')
+
+    @contextmanager
+    def transaction(self) -> Iterator["StorageSqlite"]:
+        """
+        Run the block in one SQLite transaction: COMMIT on exit, ROLLBACK if it raises.
+        """
+        if self._tx_depth == 0:
+            self._conn.execute("BEGIN")
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self._conn.rollback()
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            self._conn.commit()
+
+    # ------------- Batch API (one transaction) -------------
+
+    def add_many(self, movies: Iterable[MovieRow]) -> List[Tuple[str, str]]:
+        """
+        Add several movies in one transaction; existing titles are reported as DUPLICATE.
+        """
+        results = []
+        with self._atomic():
+            for title, year, rating, poster in movies:
+                cursor = self._conn.execute(self._SQL_INSERT, self._insert_params(title, year, rating, poster))
+                results.append((title, ADDED if cursor.rowcount else DUPLICATE))
+        return results
+
+    def update_many(self, ratings: Iterable[Tuple[str, float | None]]) -> List[Tuple[str, str]]:
+        """
+        Update several ratings in one transaction.
+        """
+        results = []
+        with self._atomic():
+            for title, rating in ratings:
+                cursor = self._conn.execute(
+                    self._SQL_UPDATE_RATING,
+                    (None if rating is None else float(rating), title.casefold()),
+                )
+                results.append((title, UPDATED if cursor.rowcount else NOT_FOUND))
+        return results
+
+    def delete_many(self, titles: Iterable[str]) -> List[Tuple[str, str]]:
+        """
+        Delete several movies in one transaction.
+        """
+        results = []
+        with self._atomic():
+            for title in titles:
+                cursor = self._conn.execute(self._SQL_DELETE, (title.casefold(),))
+                results.append((title, DELETED if cursor.rowcount else NOT_FOUND))
+        return results
+
+    def close(self) -> None:
+        """Close the underlying connection (checkpoints the WAL)."""
+        self._conn.close()
+
+    # ------------- Internals -------------
+
+    def _atomic(self) -> ContextManager:
+        """Per-statement transaction, unless an explicit transaction() is open."""
+        return nullcontext() if self._tx_depth else self._conn
+
+    @classmethod
+    def _insert_params(cls, title: str, year: str | None, rating: float | None, poster: str | None) -> tuple:
+        year_text = None if year is None else str(year)
+        return (
+            title,
+            title.casefold(),
+            year_text,
+            year_start_of(year_text),
+            None if rating is None else float(rating),
+            poster or None,
+        )
@@ -1,22 +1,34 @@
-from storage_json import StorageJson
+"""
+movie_test.py -- Manual StorageJson walkthrough (dev-only, not a pytest module)
 
-john = StorageJson("john.json")
+Run from the repo root:
+    python -m tests.movie_test
+"""
+from storage.storage_json import StorageJson
 
-print("=== LIST (empty or existing) ===")
-print(john.list_movies())
 
-print("\n=== ADD ===")
-john.add_movies("Inception", 2010, 9.0, poster=None)
-john.add_movies("Inception", 2010, 9.0, poster=None)
+def main() -> None:
+    john = StorageJson("john.json")
 
-print("\n=== LIST (after add) ===")
-print(john.list_movies())
+    print("=== LIST (empty or existing) ===")
+    print(john.list_movies())
 
+    print("\n=== ADD ===")
+    john.add_movie("Inception", 2010, 9.0, poster=None)
+    john.add_movie("Inception", 2010, 9.0, poster=None)
 
-print("\n=== UPDATE ===")
-john.update_movie("Titanic", 9.1)
-print(john.list_movies())
+    print("\n=== LIST (after add) ===")
+    print(john.list_movies())
 
-print("\n=== DELETE ===")
-john.delete_movie("Inception")
-print(john.list_movies)
\ No newline at end of file
+
+    print("\n=== UPDATE ===")
+    john.update_movie("Titanic", 9.1)
+    print(john.list_movies())
+
+    print("\n=== DELETE ===")
+    john.delete_movie("Inception")
+    print(john.list_movies())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+test_atomic_write.py -- Crash-safe replacement and group-commit writer.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import gc
+import os
+import stat
+import weakref
+
+from storage.atomic_write import AtomicWriter, atomic_replace
+
+
+def test_new_file_gets_umask_mode_and_existing_file_keeps_its_mode(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    path = tmp_path / "movies.json"
+    atomic_replace(path, lambda f: f.write("{}"))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    atomic_replace(path, lambda f: f.write("{ }"))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert path.read_text() == "{ }"
+
+
+def test_group_commit_writer_is_garbage_collected(tmp_path):
+    writer = AtomicWriter(group_commit=60)
+    path = tmp_path / "movies.csv"
+    writer.write(path, lambda f: f.write("title\n"))
+    assert writer.pending(path)
+    writer.flush()
+    assert not writer.pending(path) and path.read_text() == "title\n"
+
+    ref = weakref.ref(writer)
+    del writer
+    gc.collect()
+    assert ref() is None
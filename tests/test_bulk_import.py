@@ -0,0 +1,58 @@
+"""
+test_bulk_import.py -- run_bulk_import end to end against the local OMDb stand-in.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import threading
+
+import pytest
+
+from bulk_import import run_bulk_import
+from src.omdb_client import OmdbClient
+from src.omdb_stub_server import OmdbStubServer, synthetic_catalog
+from storage.storage_json import StorageJson
+
+CATALOG = list(synthetic_catalog(300))
+
+
+@pytest.fixture
+def client():
+    with OmdbStubServer(CATALOG) as stub:
+        omdb = OmdbClient("test-key", base_url=stub.base_url, cache=None, quota=None)
+        yield omdb
+        omdb.close()
+
+
+@pytest.fixture
+def titles_file(tmp_path):
+    path = tmp_path / "titles.txt"
+    path.write_text("\n".join(title for title, _ in CATALOG) + "\nNo Such Movie\n", encoding="utf-8")
+    return path
+
+
+def bulk_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith("bulk-")]
+
+
+def test_imports_every_title_and_resumes(tmp_path, titles_file, client):
+    storage = StorageJson(tmp_path / "movies.json")
+    counts = run_bulk_import(storage, titles_file, client=client, batch_size=50, rate=1000, show_progress=False)
+    assert counts == {"added": 300, "duplicate": 0, "not_found": 1, "failed": 0, "skipped": 0}
+    assert len(storage.list_movies()) == 300
+
+    counts = run_bulk_import(storage, titles_file, client=client, show_progress=False)
+    assert counts["skipped"] == 301
+
+
+class FailingStorage(StorageJson):
+    def add_many(self, movies):
+        raise OSError("disk full")
+
+
+def test_writer_failure_stops_the_other_stages(tmp_path, titles_file, client):
+    storage = FailingStorage(tmp_path / "movies.json")
+    with pytest.raises(OSError, match="disk full"):
+        run_bulk_import(storage, titles_file, client=client, batch_size=10, queue_size=2, rate=1000, show_progress=False)
+    assert bulk_threads() == []
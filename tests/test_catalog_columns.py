@@ -0,0 +1,75 @@
+"""
+test_catalog_columns.py -- Columnar catalog view: stats, sort orders and rebuilds on storage changes.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import math
+
+from catalog_columns import MovieColumns
+from movie_app import MovieApp
+from storage.storage_json import StorageJson
+
+
+def columns_of(rows):
+    return MovieColumns((title, {"year": year, "rating": rating}) for title, year, rating in rows)
+
+
+def titles_in(columns, order):
+    return [columns.titles[i] for i in order]
+
+
+ROWS = [
+    ("Undated", None, 7.0),
+    ("Heat", "1995", 8.3),
+    ("Dark", "2017–2020", None),
+    ("Alien", "1979", 8.5),
+    ("Twin", "1995", 6.0),
+    ("Unknown", "n/a", 8.3),
+]
+
+
+def test_median_is_the_middle_value():
+    odd = columns_of([("A", "2000", 1.0), ("B", "2000", 9.0), ("C", "2000", 2.0), ("D", "2000", None)])
+    assert odd.stats() == (4.0, 2.0, "B", "A")
+    even = columns_of([("A", "2000", 1.0), ("B", "2000", 9.0), ("C", "2000", 2.0), ("D", "2000", 4.0)])
+    assert even.stats()[1] == 3.0  # mean of the two middle values
+    assert columns_of([("A", "2000", None)]).stats() is None
+
+
+def test_rating_order_puts_unrated_last_and_keeps_ties_in_catalog_order():
+    columns = columns_of(ROWS)
+    assert titles_in(columns, columns.order_by_rating()) == ["Alien", "Heat", "Unknown", "Undated", "Twin", "Dark"]
+
+
+def test_undated_movies_sort_last_in_both_directions():
+    columns = columns_of(ROWS)
+    assert titles_in(columns, columns.order_by_year()) == ["Alien", "Heat", "Twin", "Dark", "Undated", "Unknown"]
+    assert titles_in(columns, columns.order_by_year(latest_first=True)) == [
+        "Dark", "Heat", "Twin", "Alien", "Undated", "Unknown",
+    ]
+
+
+def test_filter_drops_rows_without_the_bounded_value():
+    columns = columns_of(ROWS)
+    assert titles_in(columns, columns.filter(min_rating=8.3)) == ["Heat", "Alien", "Unknown"]
+    assert titles_in(columns, columns.filter(start_year=1990, end_year=2000)) == ["Heat", "Twin"]
+
+
+def test_app_rebuilds_columns_only_when_the_storage_version_changes(tmp_path):
+    storage = StorageJson(tmp_path / "movies.json")
+    storage.add_many([("Heat", "1995", 8.3, None), ("Alien", "1979", 8.5, None)])
+    app = MovieApp(storage)
+
+    columns = app._catalog_columns()
+    assert app._catalog_columns() is columns
+
+    storage.update_movie("Heat", 9.0)
+    rebuilt = app._catalog_columns()
+    assert rebuilt is not columns
+    assert rebuilt.ratings[rebuilt.titles.index("Heat")] == 9.0
+    assert math.isclose(rebuilt.stats()[0], 8.75)
+
+    StorageJson(tmp_path / "movies.json").delete_movie("Alien")  # another instance writes the file
+    assert app._catalog_columns().titles == ["Heat"]
@@ -0,0 +1,40 @@
+"""
+test_fuzzy_engine.py -- FuzzyEngine ranking against a plain WRatio reference.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import random
+
+import pytest
+from rapidfuzz import fuzz
+from rapidfuzz.utils import default_process
+
+from fuzzy_engine import PARALLEL_MIN_TITLES, FuzzyEngine
+
+WORDS = ["star", "wars", "dark", "night", "return", "king", "the", "of", "love", "city", "man"]
+
+
+def make_titles(count):
+    rng = random.Random(3)
+    return sorted({" ".join(rng.choices(WORDS, k=rng.randint(1, 4))).title() for _ in range(count)})
+
+
+def reference(titles, query, threshold, limit):
+    processed = default_process(query)
+    scored = [(title, fuzz.WRatio(processed, default_process(title))) for title in titles]
+    scored = [(title, score) for title, score in scored if score >= threshold]
+    scored.sort(key=lambda pair: (-pair[1], pair[0]))
+    return scored if limit is None else scored[:limit]
+
+
+@pytest.mark.parametrize("limit", [1, 3, 10, None])
+@pytest.mark.parametrize("query", ["star wrs", "the dark knight", "kng", "lvoe city"])
+def test_matches_equal_the_reference_ranking_including_ties(query, limit):
+    titles = make_titles(2_000)
+    assert len(titles) < PARALLEL_MIN_TITLES
+    found = FuzzyEngine(titles).matches(query, threshold=60, limit=limit)
+    expected = reference(titles, query, 60, limit)
+    assert [title for title, _ in found] == [title for title, _ in expected]
+    assert [round(score, 3) for _, score in found] == [round(score, 3) for _, score in expected]
@@ -0,0 +1,90 @@
+"""
+test_imdb_offline.py -- Building the offline IMDb index from TSV dumps and looking titles up in it.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import gzip
+
+import pytest
+
+from src.imdb_offline import DEFAULT_TITLE_TYPES, OfflineIndex, build_index
+from src.omdb_client import OmdbNotFound
+
+BASICS_HEADER = "tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres"
+BASICS = [
+    "tt0001\tmovie\tHeat\tHeat\t0\t1995\t\\N\t170\tCrime",
+    "tt0002\tmovie\tHeat\tHeat\t0\t1986\t\\N\t101\tAction",
+    "tt0003\ttvSeries\tDark\tDark\t0\t2017\t2020\t60\tDrama",
+    "tt0004\ttvSeries\tThe Bear\tThe Bear\t0\t2022\t\\N\t30\tComedy",
+    "tt0005\ttvEpisode\tPilot\tPilot\t0\t2005\t\\N\t22\tComedy",
+    'tt0006\tmovie\tThe "Unrated" Cut\tThe "Unrated" Cut\t0\t\\N\t\\N\t90\tDrama',
+    "tt0007\tshort\tUp!\tUp!\t0\t2009\t\\N\t5\tAnimation",
+]
+RATINGS_HEADER = "tconst\taverageRating\tnumVotes"
+RATINGS = ["tt0001\t8.3\t700000", "tt0002\t5.1\t3000", "tt0003\t8.7\t450000", "tt0004\t8.5\t200000"]
+
+
+@pytest.fixture
+def dumps(tmp_path):
+    basics = tmp_path / "title.basics.tsv.gz"
+    with gzip.open(basics, "wt", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join([BASICS_HEADER, *BASICS]) + "\n")
+    ratings = tmp_path / "title.ratings.tsv"
+    ratings.write_text("\n".join([RATINGS_HEADER, *RATINGS]) + "\n", encoding="utf-8", newline="\n")
+    return basics, ratings
+
+
+@pytest.fixture
+def index(dumps, tmp_path):
+    db = tmp_path / "imdb.sqlite3"
+    assert build_index(*dumps, db, chunk_size=2, show_progress=False) == 6  # the tvEpisode is skipped
+    offline = OfflineIndex(db)
+    yield offline
+    offline.close()
+
+
+def test_most_voted_title_wins_unless_a_year_is_given(index):
+    assert index.lookup("heat") == {"Title": "Heat", "Year": "1995", "Rating": "8.3", "Poster": None}
+    assert index.lookup("Heat", "1986")["Rating"] == "5.1"
+    with pytest.raises(OmdbNotFound):
+        index.lookup("Heat", "2001")
+
+
+def test_years_follow_omdb_conventions(index):
+    assert index.lookup("Dark")["Year"] == "2017–2020"
+    assert index.lookup("the bear")["Year"] == "2022–"
+    assert index.lookup("  UP! ")["Year"] == "2009"  # matched on the normalized title
+
+
+def test_unrated_titles_and_unquoted_fields(index):
+    assert index.lookup('The "Unrated" Cut') == {
+        "Title": 'The "Unrated" Cut', "Year": None, "Rating": None, "Poster": None,
+    }
+
+
+def test_title_types_outside_the_filter_are_not_indexed(index, dumps, tmp_path):
+    with pytest.raises(OmdbNotFound):
+        index.lookup("Pilot")
+
+    db = tmp_path / "with_episodes.sqlite3"
+    assert build_index(*dumps, db, title_types=DEFAULT_TITLE_TYPES | {"tvEpisode"}, show_progress=False) == 7
+    with_episodes = OfflineIndex(db)
+    try:
+        assert with_episodes.lookup("Pilot")["Year"] == "2005"
+    finally:
+        with_episodes.close()
+
+
+def test_failed_build_keeps_the_previous_index(index, dumps, tmp_path):
+    basics, ratings = dumps
+    ratings.write_text(RATINGS_HEADER + "\ntt0001\t8.3\tnot-a-number\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        build_index(basics, ratings, index.path, show_progress=False)
+    assert index.lookup("Heat")["Rating"] == "8.3"
+
+
+def test_missing_index_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        OfflineIndex(tmp_path / "missing.sqlite3")
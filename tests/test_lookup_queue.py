@@ -0,0 +1,131 @@
+"""
+test_lookup_queue.py -- Durable lookup queue and the "Add movie" rate-limit path.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import sqlite3
+import time
+
+import movie_app
+from lookup_queue import DONE, PENDING, LookupQueue, QueueWorker
+from movie_app import MovieApp
+from src.omdb_client import OmdbClient, OmdbRateLimit
+from src.omdb_stub_server import OmdbStubServer, synthetic_catalog
+from storage.storage_csv import StorageCsv
+from storage.storage_json import StorageJson
+
+
+class RateLimitedClient:
+    def __init__(self):
+        self.requests = 0
+
+    def fetch_by_title(self, title):
+        self.requests += 1
+        raise OmdbRateLimit("Request limit reached!")
+
+    def remaining_quota(self):
+        return None  # no ledger
+
+
+def test_only_the_most_recent_done_jobs_are_kept(tmp_path):
+    queue = LookupQueue(tmp_path / "queue.sqlite3", keep_done=3)
+    try:
+        for i in range(6):
+            queue.enqueue(f"Movie {i}")
+        queue.enqueue("Still Waiting")
+        for _ in range(6):
+            queue.complete(queue.claim())
+        assert queue.counts()[DONE] == 3
+        assert queue.counts()[PENDING] == 1
+        assert queue.claim().title == "Still Waiting"
+    finally:
+        queue.close()
+
+
+def test_add_movie_survives_a_queue_that_cannot_be_opened(tmp_path, monkeypatch, capsys):
+    def rate_limited(title):
+        raise OmdbRateLimit("limit")
+
+    def broken_queue():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(movie_app, "get_default_index", lambda: None)
+    monkeypatch.setattr(movie_app, "fetch_by_title", rate_limited)
+    monkeypatch.setattr(movie_app, "LookupQueue", broken_queue)
+    monkeypatch.setattr("builtins.input", lambda prompt="": "Heat")
+
+    MovieApp(StorageJson(tmp_path / "movies.json"))._command_add_movie()
+
+    assert "could not be queued (database is locked)" in capsys.readouterr().out
+
+
+def test_rate_limited_title_is_queued_for_the_apps_catalog(tmp_path, monkeypatch):
+    def rate_limited(title):
+        raise OmdbRateLimit("limit")
+
+    monkeypatch.setattr(movie_app, "get_default_index", lambda: None)
+    monkeypatch.setattr(movie_app, "fetch_by_title", rate_limited)
+    monkeypatch.setattr(movie_app, "LookupQueue", lambda: LookupQueue(tmp_path / "queue.sqlite3"))
+    monkeypatch.setattr("builtins.input", lambda prompt="": "Heat")
+
+    storage = StorageJson(tmp_path / "movies.json")
+    app = MovieApp(storage)
+    app._command_add_movie()
+    job = app._lookup_queue.claim()
+    app._lookup_queue.close()
+    assert (job.title, job.storage) == ("Heat", str((tmp_path / "movies.json").resolve()))
+
+
+def test_worker_adds_each_title_to_the_catalog_it_was_queued_for(tmp_path):
+    json_path, csv_path = tmp_path / "movies.json", tmp_path / "movies.csv"
+    queue = LookupQueue(tmp_path / "queue.sqlite3")
+    queue.enqueue("Movie 1", StorageJson(json_path).location())
+    queue.enqueue("Movie 2", StorageCsv(str(csv_path)).location())
+    queue.enqueue("Movie 2", StorageJson(json_path).location())  # same title, other catalog
+    with OmdbStubServer(synthetic_catalog(5)) as server:
+        client = OmdbClient("test-key", base_url=server.base_url, cache=None, quota=None)
+        QueueWorker(None, queue, client=client, rate=1000).run(until_empty=True)
+        client.close()
+    assert queue.counts()[DONE] == 3
+    queue.close()
+    assert sorted(StorageJson(json_path).list_movies()) == ["Movie 1", "Movie 2"]
+    assert list(StorageCsv(str(csv_path)).list_movies()) == ["Movie 2"]
+
+
+def test_worker_stops_claiming_after_a_rate_limit(tmp_path):
+    queue = LookupQueue(tmp_path / "queue.sqlite3")
+    for i in range(3):
+        queue.enqueue(f"Movie {i}", str(tmp_path / "movies.json"))
+    client = RateLimitedClient()
+    worker = QueueWorker(None, queue, client=client, rate=1000).start()
+    time.sleep(0.3)
+    worker.stop(timeout=5)
+    assert client.requests == 1
+    assert queue.counts()[PENDING] == 3
+    queue.close()
+
+
+def test_queue_from_before_storage_paths_is_migrated(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE jobs (
+            id INTEGER PRIMARY KEY, title TEXT NOT NULL, title_key TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, not_before REAL NOT NULL,
+            last_error TEXT, created_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("INSERT INTO jobs (title, title_key, status, not_before, created_at) VALUES ('Heat', 'heat', 'pending', 0, 0)")
+    conn.commit()
+    conn.close()
+
+    queue = LookupQueue(path)
+    try:
+        assert queue.enqueue("Heat", "/catalogs/movies.csv")  # another catalog: a new job
+        assert queue.claim() == (1, "Heat", 1, None)
+    finally:
+        queue.close()
@@ -0,0 +1,75 @@
+"""
+test_omdb_bulk.py -- fetch_many against the local OMDb stand-in server.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import pytest
+
+from src.omdb_bulk import TokenBucket, fetch_many
+from src.omdb_cache import OmdbCache
+from src.omdb_client import OmdbClient
+from src.omdb_stub_server import OmdbStubServer, synthetic_catalog
+
+
+@pytest.fixture
+def server():
+    with OmdbStubServer(synthetic_catalog(200), latency=lambda: 0.05) as stub:
+        yield stub
+
+
+class CountingCache(OmdbCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gets = 0
+
+    def get(self, title):
+        self.gets += 1
+        return super().get(title)
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self, rate):
+        super().__init__(rate)
+        self.acquired = 0
+
+    def acquire(self, tokens=1.0):
+        self.acquired += 1
+        super().acquire(tokens)
+
+
+def titles(count):
+    return [title for title, _ in synthetic_catalog(count)]
+
+
+def test_early_close_does_not_run_the_queued_titles(server):
+    delays = iter([0.0])
+    server.latency = lambda: next(delays, 0.2)  # the first answer is instant, the rest are slow
+    client = OmdbClient("test-key", base_url=server.base_url, cache=None, quota=None)
+    results = fetch_many(titles(200), client=client, max_workers=4, rate=1000)
+    assert next(results).error is None
+    results.close()
+    # The first request plus the (at most 4) running ones; the other queued
+    # titles of the 8-title window are never sent.
+    assert server.requests_served <= 5
+    client.close()
+
+
+def test_cache_is_checked_once_and_hits_spend_no_tokens(server, tmp_path):
+    cache = CountingCache(tmp_path / "cache.sqlite3")
+    client = OmdbClient("test-key", base_url=server.base_url, cache=cache, quota=None)
+    wanted = titles(10)
+    for title in wanted[:4]:
+        client.fetch_by_title(title)
+    cache.gets = 0
+    limiter = CountingBucket(1000)
+
+    results = list(fetch_many(wanted, client=client, max_workers=4, limiter=limiter))
+
+    assert sorted(result.title for result in results) == sorted(wanted)
+    assert all(result.error is None for result in results)
+    assert cache.gets == len(wanted)
+    assert limiter.acquired == 6
+    client.close()
+    cache.close()
@@ -0,0 +1,37 @@
+"""
+test_omdb_cache.py -- OMDb response cache: expiry and LRU eviction.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import itertools
+
+from src import omdb_cache
+from src.omdb_cache import OmdbCache
+
+
+def test_memory_hits_keep_entries_from_being_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(omdb_cache.time, "time", lambda: float(next(clock)))
+    cache = OmdbCache(tmp_path / "cache.sqlite3", max_entries=10)
+    try:
+        for i in range(10):
+            cache.put(f"Movie {i}", {"Title": f"Movie {i}"})
+        for _ in range(5):
+            assert cache.get("Movie 0") == (True, {"Title": "Movie 0"})  # served from memory
+
+        cache.put("Movie 10", {"Title": "Movie 10"})  # over the limit: evicts the 2 least recently used
+
+        assert cache.get("Movie 0")[0]
+        assert not cache.get("Movie 1")[0]
+        assert not cache.get("Movie 2")[0]
+        assert cache.get("Movie 3")[0]
+    finally:
+        cache.close()
+
+
+def test_default_path_is_the_user_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(omdb_cache.sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert omdb_cache.default_cache_path() == tmp_path / "movie-project" / "omdb_cache.sqlite3"
@@ -0,0 +1,83 @@
+"""
+test_omdb_resilience.py -- Circuit breaker (and its interplay with the quota) as seen through OmdbClient.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import pytest
+
+from src.omdb_client import OmdbClient, OmdbNetworkError
+from src import omdb_cache, omdb_quota
+from src.omdb_quota import QuotaLedger
+from src.omdb_resilience import CLOSED, HALF_OPEN, NO_RETRY, OPEN, CircuitBreaker, RetryPolicy
+
+
+def failing_client(breaker, error):
+    client = OmdbClient("test-key", cache=None, quota=None, retry=NO_RETRY, breaker=breaker)
+
+    def request_once(title, api_key, timeout):
+        raise error
+
+    client._request_once = request_once
+    return client
+
+
+@pytest.mark.parametrize("error", [RuntimeError("bug"), KeyboardInterrupt()])
+def test_unexpected_error_in_half_open_probe_does_not_wedge_the_breaker(error):
+    breaker = CircuitBreaker(min_calls=1, cooldown=0.0)
+    breaker.record_failure()
+    assert breaker.state == HALF_OPEN  # cooldown already over
+
+    client = failing_client(breaker, error)
+    with pytest.raises(type(error)):
+        client.fetch_by_title("Heat")
+
+    assert breaker.allow()  # the probe slot is free again
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    client.close()
+
+
+def test_unexpected_error_counts_as_a_failure():
+    breaker = CircuitBreaker(min_calls=2, cooldown=60.0)
+    client = failing_client(breaker, RuntimeError("bug"))
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            client.fetch_by_title("Heat")
+    assert breaker.state == OPEN
+    client.close()
+
+
+def test_open_breaker_does_not_spend_the_daily_quota(tmp_path):
+    ledger = QuotaLedger(tmp_path / "quota.sqlite3", daily_limit=10)
+    breaker = CircuitBreaker(min_calls=1, cooldown=60.0)
+    breaker.record_failure()
+    client = OmdbClient("test-key", cache=None, quota=ledger, breaker=breaker)
+    for _ in range(5):
+        with pytest.raises(OmdbNetworkError):
+            client.fetch_by_title("Heat")
+    assert client.remaining_quota() == 10
+    client.close()
+
+
+def test_every_retry_goes_through_before_request():
+    client = failing_client(None, OmdbNetworkError("timeout"))
+    client.retry = RetryPolicy(max_attempts=3, base_delay=0.0, jitter=False)
+    calls = []
+    with pytest.raises(OmdbNetworkError):
+        client.fetch_by_title("Heat", before_request=lambda: calls.append("token"))
+    assert calls == ["token"] * 3
+    client.close()
+
+
+def test_default_ledger_lives_next_to_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(omdb_cache.sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    ledger = QuotaLedger()
+    try:
+        assert ledger.reserve("test-key")
+    finally:
+        ledger.close()
+    assert omdb_quota.default_quota_path() == tmp_path / "movie-project" / "omdb_quota.sqlite3"
+    assert omdb_quota.default_quota_path().exists()
@@ -0,0 +1,262 @@
+"""
+test_storage_backends.py -- One IStorage behavior suite, run against every backend.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import pytest
+
+from istorage import ADDED, DELETED, DUPLICATE, NOT_FOUND, UPDATED
+from storage.storage_csv import StorageCsv
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+# StorageJson keeps the original JSON semantics: add_movie overwrites an
+# existing title and delete/update ignore unknown titles. The CSV and SQLite
+# backends raise ValueError / KeyError instead.
+BACKENDS = {
+    "json": (StorageJson, "movies.json", False),
+    "csv": (StorageCsv, "movies.csv", True),
+    "sqlite": (StorageSqlite, "movies.sqlite3", True),
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request, tmp_path):
+    cls, name, strict = BACKENDS[request.param]
+    path = tmp_path / name
+    opened = []
+
+    def open_storage():
+        storage = cls(str(path))
+        opened.append(storage)
+        return storage
+
+    yield open_storage, strict
+    for storage in opened:
+        if isinstance(storage, StorageSqlite):
+            storage.close()
+
+
+@pytest.fixture
+def storage(backend):
+    open_storage, _ = backend
+    return open_storage()
+
+
+def records(storage):
+    return {title: (movie["year"], movie["rating"], movie["poster"]) for title, movie in storage.list_movies().items()}
+
+
+def test_new_storage_is_empty(storage):
+    assert records(storage) == {}
+    assert list(storage.iter_movies()) == []
+
+
+def test_add_movie_persists_across_instances(backend):
+    open_storage, _ = backend
+    storage = open_storage()
+    storage.add_movie("Titanic", "1997", 7.9, "http://poster/titanic.jpg")
+    storage.add_movie("Dark", "2017–2020", None, None)
+
+    expected = {
+        "Titanic": ("1997", 7.9, "http://poster/titanic.jpg"),
+        "Dark": ("2017–2020", None, None),
+    }
+    assert records(storage) == expected
+    assert records(open_storage()) == expected
+
+
+def test_records_expose_movie_attributes(storage):
+    storage.add_movie("Dark", "2017–2020", 8.7, None)
+    movie = storage.list_movies()["Dark"]
+    assert (movie.title, movie.year_raw, movie.year_start, movie.rating) == ("Dark", "2017–2020", 2017, 8.7)
+
+
+def test_list_movies_is_a_detached_snapshot(storage):
+    storage.add_many([("Alien", "1979", 8.5, None), ("Heat", "1995", 8.3, None)])
+    movies = storage.list_movies()
+    for title in movies:  # mutating while iterating must not raise
+        storage.delete_movie(title)
+        storage.add_movie(title + " II", None, None, None)
+    assert sorted(movies) == ["Alien", "Heat"]
+    assert sorted(storage.list_movies()) == ["Alien II", "Heat II"]
+
+
+def test_duplicate_add(backend):
+    open_storage, strict = backend
+    storage = open_storage()
+    storage.add_movie("Titanic", "1997", 7.9, None)
+    if strict:
+        with pytest.raises(ValueError):
+            storage.add_movie("Titanic", "1997", 5.0, None)
+        assert records(storage) == {"Titanic": ("1997", 7.9, None)}
+    else:
+        storage.add_movie("Titanic", "1997", 5.0, None)
+        assert records(storage) == {"Titanic": ("1997", 5.0, None)}
+
+
+def test_update_movie(backend):
+    open_storage, strict = backend
+    storage = open_storage()
+    storage.add_movie("Titanic", "1997", 7.9, None)
+    storage.update_movie("Titanic", 9.1)
+    assert records(open_storage()) == {"Titanic": ("1997", 9.1, None)}
+
+    if strict:
+        with pytest.raises(KeyError):
+            storage.update_movie("Missing", 1.0)
+    else:
+        storage.update_movie("Missing", 1.0)
+    assert records(storage) == {"Titanic": ("1997", 9.1, None)}
+
+
+def test_delete_movie(backend):
+    open_storage, strict = backend
+    storage = open_storage()
+    storage.add_movie("Titanic", "1997", 7.9, None)
+    storage.add_movie("Heat", "1995", 8.3, None)
+    storage.delete_movie("Titanic")
+    assert records(open_storage()) == {"Heat": ("1995", 8.3, None)}
+
+    if strict:
+        with pytest.raises(KeyError):
+            storage.delete_movie("Titanic")
+    else:
+        storage.delete_movie("Titanic")
+    assert records(storage) == {"Heat": ("1995", 8.3, None)}
+
+
+def test_add_many(backend):
+    open_storage, _ = backend
+    storage = open_storage()
+    storage.add_movie("Heat", "1995", 8.3, None)
+    results = storage.add_many([
+        ("Alien", "1979", 8.5, None),
+        ("Heat", "1995", 1.0, None),
+        ("Up", "2009", None, "http://poster/up.jpg"),
+        ("Alien", "1979", 1.0, None),
+    ])
+    assert results == [("Alien", ADDED), ("Heat", DUPLICATE), ("Up", ADDED), ("Alien", DUPLICATE)]
+    assert records(open_storage()) == {
+        "Heat": ("1995", 8.3, None),
+        "Alien": ("1979", 8.5, None),
+        "Up": ("2009", None, "http://poster/up.jpg"),
+    }
+
+
+def test_update_and_delete_many(backend):
+    open_storage, _ = backend
+    storage = open_storage()
+    storage.add_many([("Alien", "1979", 8.5, None), ("Heat", "1995", 8.3, None), ("Up", "2009", 8.2, None)])
+
+    assert storage.update_many([("Alien", 9.0), ("Missing", 1.0), ("Up", None)]) == [
+        ("Alien", UPDATED), ("Missing", NOT_FOUND), ("Up", UPDATED),
+    ]
+    assert storage.delete_many(["Heat", "Missing"]) == [("Heat", DELETED), ("Missing", NOT_FOUND)]
+    assert records(open_storage()) == {"Alien": ("1979", 9.0, None), "Up": ("2009", None, None)}
+
+
+def test_transaction_commits_on_exit(backend):
+    open_storage, _ = backend
+    storage = open_storage()
+    storage.add_movie("Heat", "1995", 8.3, None)
+    with storage.transaction():
+        storage.add_movie("Alien", "1979", 8.5, None)
+        storage.update_movie("Heat", 9.0)
+        with storage.transaction():  # nested blocks join the outer one
+            storage.delete_movie("Alien")
+            storage.add_movie("Up", "2009", 8.2, None)
+        assert records(storage) == {"Heat": ("1995", 9.0, None), "Up": ("2009", 8.2, None)}
+    assert records(open_storage()) == {"Heat": ("1995", 9.0, None), "Up": ("2009", 8.2, None)}
+
+
+def test_transaction_rolls_back_on_error(backend):
+    open_storage, _ = backend
+    storage = open_storage()
+    storage.add_movie("Heat", "1995", 8.3, None)
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            storage.add_movie("Alien", "1979", 8.5, None)
+            storage.delete_movie("Heat")
+            raise RuntimeError("boom")
+    assert records(storage) == {"Heat": ("1995", 8.3, None)}
+    assert records(open_storage()) == {"Heat": ("1995", 8.3, None)}
+
+
+def test_iter_movies_matches_list_movies(backend):
+    open_storage, _ = backend
+    storage = open_storage()
+    storage.add_many([("Alien", "1979", 8.5, None), ("Heat", "1995", None, None), ("Up", "2009", 8.2, None)])
+
+    for reader in (storage, open_storage()):
+        streamed = list(reader.iter_movies())
+        assert [title for title, _ in streamed] == ["Alien", "Heat", "Up"]
+        assert {title: movie.to_dict() for title, movie in streamed} == {
+            title: movie.to_dict() for title, movie in reader.list_movies().items()
+        }
+
+
+def test_version_tracks_changes(backend):
+    open_storage, _ = backend
+    storage = open_storage()
+    initial = storage.version()
+    assert storage.version() == initial
+
+    storage.add_movie("Heat", "1995", 8.3, None)
+    after_add = storage.version()
+    assert after_add != initial
+    assert storage.version() == after_add
+
+    storage.update_movie("Heat", 9.0)
+    after_update = storage.version()
+    assert after_update != after_add
+
+    storage.delete_movie("Heat")
+    assert storage.version() != after_update
+
+
+def test_version_sees_writes_from_another_instance(backend):
+    open_storage, _ = backend
+    reader, writer = open_storage(), open_storage()
+    before = reader.version()
+    writer.add_movie("Heat", "1995", 8.3, None)
+    assert reader.version() != before
+    assert records(reader) == {"Heat": ("1995", 8.3, None)}
+
+
+def test_failed_write_leaves_storage_matching_the_file(backend, monkeypatch):
+    open_storage, strict = backend
+    storage = open_storage()
+    if isinstance(storage, StorageSqlite):
+        pytest.skip("SQLite rolls a failed statement back itself")
+    storage.add_many([("Alien", "1979", 8.5, None), ("Heat", "1995", 8.3, None)])
+    expected = records(storage)
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("storage.atomic_write.os.replace", failing_replace)
+        for change in [
+            lambda: storage.delete_movie("Heat"),
+            lambda: storage.update_movie("Alien", 1.0),
+            lambda: storage.update_many([("Alien", 1.0)]),
+            lambda: storage.delete_many(["Alien", "Heat"]),
+        ] + ([] if strict else [lambda: storage.add_many([("Up", "2009", 8.2, None), ("Heat", "1995", 1.0, None)])]):
+            with pytest.raises(OSError):
+                change()
+            assert records(storage) == expected
+        with pytest.raises(OSError):
+            with storage.transaction():
+                storage.add_movie("Up", "2009", 8.2, None)
+                storage.delete_movie("Heat")
+        assert records(storage) == expected
+    assert records(open_storage()) == expected
+
+    storage.add_movie("Up", "2009", 8.2, None)
+    if strict:
+        with pytest.raises(ValueError):
+            storage.add_movie("Heat", "1995", 8.3, None)
+    assert records(open_storage()) == {**expected, "Up": ("2009", 8.2, None)}
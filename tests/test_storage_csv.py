@@ -0,0 +1,96 @@
+"""
+test_storage_csv.py -- StorageCsv behavior that depends on the file's raw contents.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import csv
+
+import pytest
+
+from storage.storage_csv import StorageCsv
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_duplicate_titles_last_row_wins_and_survive_rewrites(tmp_path):
+    path = tmp_path / "movies.csv"
+    write_csv(path, ["title", "rating", "year", "poster"], [
+        ["Up", "1.0", "2009", ""],
+        ["Heat", "8.3", "1995", ""],
+        ["", "5.0", "2000", ""],
+        ["UP", "2.0", "2009", ""],
+    ])
+    storage = StorageCsv(str(path))
+    assert {title: movie.rating for title, movie in storage.list_movies().items()} == {"UP": 2.0, "Heat": 8.3}
+
+    storage.update_movie("Heat", 9.0)  # rewrites the file
+    titles = [row[0] for row in read_csv(path)[1:]]
+    assert sorted(titles) == ["", "Heat", "UP", "Up"]
+    assert {title: movie.rating for title, movie in StorageCsv(str(path)).list_movies().items()} == {
+        "UP": 2.0, "Heat": 9.0,
+    }
+
+    storage.delete_movie("up")  # removes every row of the title, not just the winner
+    assert [row[0] for row in read_csv(path)[1:]] == ["", "Heat"]
+    assert list(StorageCsv(str(path)).list_movies()) == ["Heat"]
+
+
+def test_add_writes_under_the_files_own_header_order(tmp_path):
+    path = tmp_path / "movies.csv"
+    write_csv(path, ["year", "poster", "title", "rating", "notes"], [["1995", "", "Heat", "8.3", "seen"]])
+    storage = StorageCsv(str(path))
+    storage.add_movie("Alien", "1979", 8.5, "http://poster/alien.jpg")
+
+    assert read_csv(path)[-1] == ["1979", "http://poster/alien.jpg", "Alien", "8.5", ""]
+    movies = StorageCsv(str(path)).list_movies()
+    assert (movies["Alien"].year_raw, movies["Alien"].rating, movies["Alien"].poster) == (
+        "1979", 8.5, "http://poster/alien.jpg",
+    )
+    assert movies["Heat"].rating == 8.3
+
+
+def test_failed_rewrite_does_not_desync_the_index(tmp_path, monkeypatch):
+    path = tmp_path / "movies.csv"
+    storage = StorageCsv(str(path))
+    storage.add_movie("Heat", "1995", 8.3, None)
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("storage.atomic_write.os.replace", failing_replace)
+        with pytest.raises(OSError):
+            storage.delete_movie("Heat")
+    storage.add_movie("Up", "2009", 8.2, None)  # appends and refreshes the file stamp
+    with pytest.raises(ValueError):
+        storage.add_movie("Heat", "1995", 8.3, None)
+    assert [row[0] for row in read_csv(path)[1:]] == ["Heat", "Up"]
+
+
+def test_failed_append_rereads_the_file(tmp_path, monkeypatch):
+    path = tmp_path / "movies.csv"
+    storage = StorageCsv(str(path))
+    storage.add_movie("Heat", "1995", 8.3, None)
+
+    def failing_append(self, path, write_fn):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("storage.atomic_write.AtomicWriter.append", failing_append)
+        with pytest.raises(OSError):
+            storage.add_many([("Alien", "1979", 8.5, None), ("Up", "2009", 8.2, None)])
+    assert list(storage.list_movies()) == ["Heat"]
+    storage.add_movie("Alien", "1979", 8.5, None)
+    assert list(StorageCsv(str(path)).list_movies()) == ["Heat", "Alien"]
@@ -0,0 +1,36 @@
+"""
+test_storage_sqlite.py -- StorageSqlite behavior beyond the shared backend suite.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import sqlite3
+
+import pytest
+
+from istorage import ADDED, DUPLICATE
+from storage.storage_sqlite import StorageSqlite
+
+
+def test_add_many_reports_only_title_clashes_as_duplicates(tmp_path):
+    path = tmp_path / "movies.sqlite3"
+    # A catalog created with a stricter schema than StorageSqlite's own.
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE movies (title TEXT NOT NULL, title_key TEXT NOT NULL, year TEXT,"
+            " year_start INTEGER, rating REAL CHECK (rating BETWEEN 0 AND 10), poster TEXT)"
+        )
+    conn.close()
+    storage = StorageSqlite(path)
+    try:
+        assert storage.add_many([("Heat", "1995", 8.3, None), ("HEAT", "1995", 1.0, None)]) == [
+            ("Heat", ADDED), ("HEAT", DUPLICATE),
+        ]
+        with pytest.raises(sqlite3.IntegrityError):
+            storage.add_many([("Alien", "1979", 11.0, None)])
+        with pytest.raises(sqlite3.IntegrityError):
+            storage.add_movie("Alien", "1979", -1.0, None)
+        assert list(storage.list_movies()) == ["Heat"]
+    finally:
+        storage.close()
@@ -0,0 +1,50 @@
+"""
+test_title_search.py -- Trigram index and title resolution on edge-case catalogs.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import pytest
+
+from movies import select_title_from_user_query
+from title_index import TitleIndex
+from trigram_index import TrigramIndex
+
+
+@pytest.mark.parametrize("keys", [["x", "y", "z"], ["up", "it"], ["up", "it", "ab", "cd"]])
+def test_index_over_keys_shorter_than_a_trigram(keys):
+    index = TrigramIndex((key.upper(), key) for key in keys)
+    assert index.search("upside") == []
+    assert index.most_shared("upside", 10) == []
+
+    index.add("Upside", "upside")
+    assert index.search("psi") == ["Upside"]
+
+
+def test_compaction_of_an_all_short_catalog_does_not_fail():
+    index = TrigramIndex()
+    for i in range(1100):  # past the compaction threshold
+        index.add(f"T{i % 10}{i}", f"{i % 100:02}")
+    assert index.search("999") == []
+
+
+def test_select_title_on_a_catalog_of_short_titles(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+    assert select_title_from_user_query({"Up": {}, "It": {}}, "up") == "Up"
+    assert select_title_from_user_query({"Up": {}, "It": {}}, "Upside") == "Up"
+
+
+def test_exact_owner_passes_to_the_next_title_with_the_same_key():
+    index = TitleIndex(["Heat", "Alien", "HEAT", " heat "])
+    assert index.exact("heat") == "Heat"
+    index.remove("HEAT")  # not the owner: nothing changes
+    assert index.exact("heat") == "Heat"
+    index.remove("Heat")
+    assert index.exact("HEAT") == " heat "
+    index.add("Heat")  # re-added titles queue up behind the current owner
+    index.remove(" heat ")
+    assert index.exact("heat") == "Heat"
+    index.remove("Heat")
+    assert index.exact("heat") is None
+    assert index.titles() == ["Alien"]
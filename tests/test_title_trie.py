@@ -0,0 +1,86 @@
+"""
+test_title_trie.py -- TitleTrie completions checked against a brute-force sort.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+
+import itertools
+import math
+import random
+
+import pytest
+
+from title_trie import BURST_SIZE, TitleTrie
+from utils import normalize_title
+
+# A tiny alphabet makes titles share long prefixes, so leaves burst and the
+# cached top lists of inner nodes are exercised on every path.
+ALPHABET = "ab c"
+PREFIXES = ["".join(p) for n in range(4) for p in itertools.product(ALPHABET, repeat=n)]
+
+
+def random_title(rng):
+    title = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 7))).strip() or "a"
+    return title.upper() if rng.random() < 0.1 else title
+
+
+def brute_force(ratings, prefix, limit):
+    key = normalize_title(prefix)
+    if key and prefix[-1:].isspace():
+        key += " "
+    ranked = sorted(
+        (-rating if rating is not None else math.inf, title)
+        for title, rating in ratings.items()
+        if normalize_title(title).startswith(key)
+    )
+    return [title for _, title in ranked[:limit]]
+
+
+def check(trie, ratings, prefixes):
+    for prefix in prefixes:
+        for limit in (1, trie.top_n):
+            assert trie.complete(prefix, limit) == brute_force(ratings, prefix, limit), (prefix, limit)
+
+
+@pytest.mark.parametrize("top_n", [3, 10])
+def test_completions_match_brute_force_across_changes(top_n):
+    rng = random.Random(top_n)
+    ratings = {}
+    trie = TitleTrie(top_n=top_n)
+    for step in range(2000):
+        op = rng.random()
+        if op < 0.5 or not ratings:
+            title = random_title(rng)
+            rating = None if rng.random() < 0.2 else rng.choice([1.0, 5.5, 7.0, 7.5, 9.0])
+            trie.add(title, rating)
+            ratings[title] = rating
+        elif op < 0.75:
+            title = rng.choice(sorted(ratings))
+            trie.remove(title)
+            del ratings[title]
+        else:
+            title = rng.choice(sorted(ratings))
+            rating = None if rng.random() < 0.2 else rng.choice([2.0, 6.0, 8.0, 10.0])
+            trie.update(title, rating)
+            ratings[title] = rating
+
+        key = normalize_title(title)
+        check(trie, ratings, [key[:n] for n in range(len(key) + 1)])
+        if step % 100 == 0:
+            check(trie, ratings, PREFIXES)
+        assert len(trie) == len(ratings)
+    assert len(ratings) > BURST_SIZE  # large enough that leaves have burst
+    check(trie, ratings, PREFIXES)
+
+
+def test_bulk_build_matches_brute_force():
+    rng = random.Random(7)
+    ratings = {random_title(rng): rng.choice([None, 3.0, 6.5, 8.0]) for _ in range(500)}
+    trie = TitleTrie(ratings.items(), top_n=5)
+    check(trie, ratings, PREFIXES + ["ab ", "b c "])
+
+    for title in list(ratings)[::2]:
+        trie.remove(title)
+        del ratings[title]
+    check(trie, ratings, PREFIXES + ["ab ", "b c "])
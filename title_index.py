@@ -0,0 +1,95 @@
+"""
+title_index.py -- normalized-title index for resolving user queries against the catalog
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fuzzy_engine import FuzzyEngine
+from trigram_index import TrigramIndex
+from utils import FUZZY_LIMIT, FUZZY_THRESHOLD, normalize_title
+
+
+class TitleIndex:
+    """
+    Stored titles with their normalize_title() keys, computed once:
+
+        exact(query)     -- dict lookup instead of normalizing every title
+        substring(query) -- trigram index lookup for queries of 3+ characters
+                            (built on first use), a scan over the cached keys
+                            for shorter ones
+        fuzzy(query)     -- top-k WRatio matches from a FuzzyEngine (built on
+                            first use, dropped on writes)
+
+    Build it once per storage version and keep it current with add()/remove()
+    after writes, rather than re-normalizing the catalog on every search.
+    """
+
+    def __init__(self, titles: Iterable[str] = ()) -> None:
+        # title -> key, in catalog order (substring results keep that order)
+        self._keys: Dict[str, str] = {}
+        # key -> titles with that key, in catalog order (used as an ordered
+        # set); the first is what the exact pass returns
+        self._by_key: Dict[str, Dict[str, None]] = {}
+        self._trigrams: Optional[TrigramIndex] = None
+        self._fuzzy: Optional[FuzzyEngine] = None
+        for title in titles:
+            self.add(title)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, title: object) -> bool:
+        return title in self._keys
+
+    def titles(self) -> List[str]:
+        return list(self._keys)
+
+    def add(self, title: str) -> None:
+        if title in self._keys:
+            return
+        key = normalize_title(title)
+        self._keys[title] = key
+        self._by_key.setdefault(key, {})[title] = None
+        if self._trigrams is not None:
+            self._trigrams.add(title, key)
+        self._fuzzy = None
+
+    def remove(self, title: str) -> None:
+        key = self._keys.pop(title, None)
+        if key is None:
+            return
+        if self._trigrams is not None:
+            self._trigrams.remove(title)
+        self._fuzzy = None
+        # Another title may normalize to the same key; the next in order takes over.
+        owners = self._by_key[key]
+        del owners[title]
+        if not owners:
+            del self._by_key[key]
+
+    def exact(self, query: str) -> Optional[str]:
+        """The stored title whose normalized form equals the query's, if any."""
+        owners = self._by_key.get(normalize_title(query))
+        return next(iter(owners)) if owners else None
+
+    def substring(self, query: str) -> List[str]:
+        """Titles whose normalized form contains the normalized query, in catalog order."""
+        norm_query = normalize_title(query)
+        if len(norm_query) < 3:
+            return [title for title, key in self._keys.items() if norm_query in key]
+        if self._trigrams is None:
+            self._trigrams = TrigramIndex(self._keys.items())
+        return self._trigrams.search(norm_query)
+
+    def fuzzy(
+        self,
+        query: str,
+        threshold: float = FUZZY_THRESHOLD,
+        limit: Optional[int] = FUZZY_LIMIT,
+    ) -> List[Tuple[str, float]]:
+        """Best (title, score) fuzzy matches, see FuzzyEngine.matches()."""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyEngine(self._keys)
+        return self._fuzzy.matches(query, threshold, limit)
@@ -0,0 +1,167 @@
+"""
+title_trie.py -- prefix index over normalized titles for type-ahead completion
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils import normalize_title
+
+DEFAULT_TOP_N = 10
+# A leaf holds up to this many titles in one sorted bucket before it is
+# split into one child per next character (a "burst trie"); this keeps
+# the node count, and memory, far below one node per character.
+BURST_SIZE = 32
+
+# (sort key, title, normalized key); the sort key puts higher ratings
+# first, unrated titles last, ties alphabetically.
+_Entry = Tuple[float, str, str]
+
+
+def _entry(title: str, key: str, rating: Optional[float]) -> _Entry:
+    return (-rating if isinstance(rating, (int, float)) else math.inf, title, key)
+
+
+class _Node:
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node] = {}
+        # Sorted. A leaf (no children) holds its whole subtree here; an
+        # inner node only the keys that end at its depth.
+        self.entries: List[_Entry] = []
+        # Inner nodes only: the best top_n entries of the subtree, sorted.
+        self.top: List[_Entry] = []
+
+
+class TitleTrie:
+    """
+    Burst trie over normalize_title() keys. Inner nodes cache the top-N
+    titles of their subtree by rating; leaves keep a small sorted bucket.
+    complete(prefix) walks at most len(prefix) nodes and then slices a
+    cached list or filters one bucket, independent of catalog size.
+
+    add()/remove()/update() keep the caches exact: an add inserts into the
+    cached lists along its path; a remove recomputes only the nodes whose
+    cached list contained the title, from their children's lists.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Tuple[str, Optional[float]]] = (),
+        *,
+        top_n: int = DEFAULT_TOP_N,
+    ) -> None:
+        self.top_n = top_n
+        self._root = _Node()
+        self._entries: Dict[str, _Entry] = {}
+        for title, rating in items:
+            self.add(title, rating)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, title: object) -> bool:
+        return title in self._entries
+
+    def add(self, title: str, rating: Optional[float] = None) -> None:
+        """Index a title (a title already present is re-ranked with the new rating)."""
+        if title in self._entries:
+            self.remove(title)
+        entry = _entry(title, normalize_title(title), rating)
+        self._entries[title] = entry
+        key = entry[2]
+        node, depth = self._root, 0
+        while node.children and depth < len(key):
+            self._offer(node, entry)
+            node = node.children.setdefault(key[depth], _Node())
+            depth += 1
+        bisect.insort(node.entries, entry)
+        if node.children:
+            self._offer(node, entry)
+        elif len(node.entries) > BURST_SIZE:
+            self._burst(node, depth)
+
+    def update(self, title: str, rating: Optional[float]) -> None:
+        self.add(title, rating)
+
+    def remove(self, title: str) -> None:
+        entry = self._entries.pop(title, None)
+        if entry is None:
+            return
+        key = entry[2]
+        path = [self._root]
+        while path[-1].children and len(path) - 1 < len(key):
+            path.append(path[-1].children[key[len(path) - 1]])
+        last = path[-1]
+        del last.entries[bisect.bisect_left(last.entries, entry)]
+        # Bottom-up: an inner node's cache can only change if it held the entry.
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if not node.children:
+                node.top = []
+                if depth and not node.entries:
+                    del path[depth - 1].children[key[depth - 1]]
+                continue
+            if entry not in node.top:
+                break
+            candidates = node.entries[:self.top_n]
+            for child in node.children.values():
+                candidates.extend(self._best(child))
+            candidates.sort()
+            node.top = candidates[:self.top_n]
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Up to `limit` (default top_n, at most top_n) titles whose normalized
+        form starts with the normalized prefix, best rated first. A trailing
+        space in `prefix` is kept, so "star " does not complete "Stardust".
+        """
+        limit = self.top_n if limit is None else min(limit, self.top_n)
+        key = normalize_title(prefix)
+        if key and prefix[-1:].isspace():
+            key += " "
+        node, depth = self._root, 0
+        while node.children and depth < len(key):
+            node = node.children.get(key[depth])
+            if node is None:
+                return []
+            depth += 1
+        if depth == len(key):
+            return [title for _, title, _ in self._best(node)[:limit]]
+        # Stopped at a leaf: its bucket is sorted, so the first matches win.
+        matches = []
+        for _, title, entry_key in node.entries:
+            if entry_key.startswith(key):
+                matches.append(title)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def _best(self, node: _Node) -> List[_Entry]:
+        return node.top if node.children else node.entries[:self.top_n]
+
+    def _offer(self, node: _Node, entry: _Entry) -> None:
+        top = node.top
+        if len(top) < self.top_n or entry < top[-1]:
+            bisect.insort(top, entry)
+            del top[self.top_n:]
+
+    def _burst(self, node: _Node, depth: int) -> None:
+        """Split a full leaf into one child per next character."""
+        stay = []
+        for entry in node.entries:  # sorted, so every child's bucket is too
+            if len(entry[2]) == depth:
+                stay.append(entry)
+            else:
+                node.children.setdefault(entry[2][depth], _Node()).entries.append(entry)
+        if not node.children:
+            return  # every key ends here (same normalized title); nothing to split
+        node.top = node.entries[:self.top_n]
+        node.entries = stay
+        for child in node.children.values():
+            if len(child.entries) > BURST_SIZE:
+                self._burst(child, depth + 1)
@@ -0,0 +1,171 @@
+"""
+trigram_index.py -- trigram inverted index over normalized strings (substring search, fuzzy pre-filter)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Below this many candidates, checking them directly is cheaper than
+# intersecting further posting lists.
+_VERIFY_DIRECTLY = 2048
+
+
+def trigram_codes(text: str) -> Set[int]:
+    """
+    Distinct trigrams of `text`'s UTF-8 bytes, each packed into an int.
+    Byte trigrams keep the index build vectorizable and are still a valid
+    filter: if a query is a substring of a key, its bytes are too.
+    """
+    data = text.encode("utf-8")
+    return {data[i] << 16 | data[i + 1] << 8 | data[i + 2] for i in range(len(data) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigrams to the entries whose key contains them.
+
+    A key can contain a query of 3+ characters only if it contains every
+    trigram of the query, so a search intersects those posting lists
+    (rarest first) and verifies only the surviving candidates.
+
+    The postings built up front live in one sorted int32 array, computed
+    with NumPy over all keys at once. Entries added later go into small
+    per-trigram sets, and removed entries are tombstoned; once either side
+    grows past a quarter of the index it is rebuilt.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]] = ()) -> None:
+        self._build(list(entries))
+
+    def _build(self, entries: List[Tuple[str, str]]) -> None:
+        self._entries: List[Optional[Tuple[str, str]]] = list(entries)
+        self._ids: Dict[str, int] = {title: i for i, (title, _) in enumerate(self._entries)}
+        self._base_size = len(self._entries)
+        self._delta: Dict[int, Set[int]] = {}
+        self._delta_count = 0
+        self._tombstones: Set[int] = set()
+
+        encoded = [key.encode("utf-8") for _, key in self._entries]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.int64)
+        if len(data) < 3:
+            self._postings = np.empty(0, dtype=np.int32)
+            self._spans: Dict[int, Tuple[int, int]] = {}
+            return
+        # Trigram code and entry id at every byte position; keep the
+        # positions whose trigram lies within a single key.
+        codes = data[:-2] << 16 | data[1:-1] << 8 | data[2:]
+        entry_of = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths)[:-2]
+        ends = np.cumsum(lengths)
+        inside = np.arange(len(codes)) + 3 <= ends[entry_of]
+        # Sorting (code, id) pairs groups each posting list with ids ascending;
+        # duplicates (a trigram repeated within a key) end up adjacent.
+        pairs = np.sort(codes[inside] << 32 | entry_of[inside])
+        if not len(pairs):
+            # Every key is under 3 bytes: nothing to index.
+            self._postings = np.empty(0, dtype=np.int32)
+            self._spans = {}
+            return
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+        codes = pairs >> 32
+        self._postings = (pairs & 0xFFFFFFFF).astype(np.int32)
+        bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.concatenate(([0], bounds))
+        stops = np.concatenate((bounds, [len(pairs)]))
+        self._spans = dict(zip(codes[starts].tolist(), zip(starts.tolist(), stops.tolist())))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, title: str, key: str) -> None:
+        if title in self._ids:
+            return
+        entry_id = len(self._entries)
+        self._entries.append((title, key))
+        self._ids[title] = entry_id
+        for code in trigram_codes(key):
+            self._delta.setdefault(code, set()).add(entry_id)
+        self._delta_count += 1
+        self._maybe_compact()
+
+    def remove(self, title: str) -> None:
+        entry_id = self._ids.pop(title, None)
+        if entry_id is None:
+            return
+        self._entries[entry_id] = None
+        self._tombstones.add(entry_id)
+        self._maybe_compact()
+
+    def search(self, norm_query: str) -> List[str]:
+        """
+        Titles whose key contains `norm_query` (already normalized, at least
+        3 characters), in insertion order.
+        """
+        codes = trigram_codes(norm_query)
+        ids = self._search_base(codes)
+        if self._delta:
+            delta_ids = self._search_delta(codes)
+            if delta_ids:
+                ids = sorted(set(ids).union(delta_ids))
+        entries = self._entries
+        matches = []
+        for i in ids:
+            entry = entries[i]
+            if entry is not None and norm_query in entry[1]:
+                matches.append(entry[0])
+        return matches
+
+    def most_shared(self, text: str, limit: int) -> List[int]:
+        """
+        Ids of up to `limit` live entries sharing the most trigrams with
+        `text` (any number of characters), most shared first. Entries
+        sharing none are never returned. Used as a cheap candidate
+        pre-filter before an expensive similarity score.
+        """
+        codes = trigram_codes(text)
+        counts = np.zeros(len(self._entries), dtype=np.int32)
+        lists = [self._postings[span[0]:span[1]] for span in map(self._spans.get, codes) if span is not None]
+        if lists:
+            base = np.bincount(np.concatenate(lists), minlength=self._base_size)
+            counts[:self._base_size] = base
+        for code in codes:
+            for entry_id in self._delta.get(code, ()):
+                counts[entry_id] += 1
+        if self._tombstones:
+            counts[list(self._tombstones)] = 0
+        shared = np.flatnonzero(counts)
+        if len(shared) > limit:
+            shared = np.sort(shared[np.argpartition(-counts[shared], limit - 1)[:limit]])
+        return shared[np.argsort(-counts[shared], kind="stable")].tolist()
+
+    def _search_base(self, codes: Set[int]) -> List[int]:
+        lists = []
+        for code in codes:
+            span = self._spans.get(code)
+            if span is None:
+                return []
+            lists.append(self._postings[span[0]:span[1]])
+        lists.sort(key=len)
+        candidates = lists[0]
+        for postings in lists[1:]:
+            if len(candidates) <= _VERIFY_DIRECTLY:
+                break
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+        return candidates.tolist()
+
+    def _search_delta(self, codes: Set[int]) -> Set[int]:
+        sets = []
+        for code in codes:
+            ids = self._delta.get(code)
+            if not ids:
+                return set()
+            sets.append(ids)
+        sets.sort(key=len)
+        return set.intersection(*sets)
+
+    def _maybe_compact(self) -> None:
+        if max(self._delta_count, len(self._tombstones)) > max(1024, self._base_size // 4):
+            self._build([entry for entry in self._entries if entry is not None])
@@ -1,12 +1,12 @@
 """
-Normalize_title / substring_matches / fuzzy_matches
+Normalize_title / substring_matches (fuzzy matching lives in fuzzy_engine.py)
 """
 
 import unicodedata
-from typing import Iterable, List, Tuple
-from rapidfuzz import fuzz
+from typing import Iterable, List
 
 FUZZY_THRESHOLD = 60
+FUZZY_LIMIT = 10  # most fuzzy matches offered to pick from
 
 
 def normalize_title(text: str) -> str:
@@ -47,30 +47,3 @@ def substring_matches(all_titles: Iterable[str], query: str) -> List[str]:
     norm_query = normalize_title(query)
     return [t for t in all_titles if norm_query in normalize_title(t)]
 
-
-def fuzzy_matches(
-    all_titles: Iterable[str],
-    query: str,
-    threshold: int = FUZZY_THRESHOLD,
-) -> List[Tuple[str, int]]:
-    """
-    Rank titles by fuzzy similarity to the query and return those above a threshold.
-
-    Uses RapidFuzz's `WRatio` scorer (hybrid token/ratio heuristic) to compute a
-    similarity score in [0, 100] between the raw `query` and each title.
-
-    Args:
-        all_titles: An iterable of movie titles to score.
-        query: The user-provided search text (un-normalized; WRatio handles this).
-        threshold: Minimum score a title must reach to be included (default 60).
-
-    Returns:
-        A list of (title, score) tuples filtered to scores >= `threshold`,
-        sorted by:
-            1) score descending, then
-            2) title ascending (as a deterministic tie-breaker).
-    """
-    scored = [(t, fuzz.WRatio(query, t)) for t in all_titles]
-    scored = [(t, s) for t, s in scored if s >= threshold]
-    scored.sort(key=lambda t: (-t[1], t[0]))
-    return scored
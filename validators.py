@@ -1,6 +1,7 @@
 """ input helpers (prompt_title/rating/year/etc"""
 
-from typing import Optional
+from contextlib import contextmanager
+from typing import Callable, List, Optional
 import math
 from datetime import datetime
 from colorama import Fore
@@ -28,24 +29,62 @@ def safe_float(s: str) -> Optional[float]:
         return None
 
 
-def prompt_title(prompt_msg: str) -> str:
+def prompt_title(prompt_msg: str, completer: Optional[Callable[[str], List[str]]] = None) -> str:
     """
     Prompt the user repeatedly until they enter a non-empty title.
 
     UI:
         - Uses Colorama to color the prompt (magenta) and error messages (red).
+        - With `completer` and a readline-capable terminal, Tab completes the
+          title typed so far (e.g. MovieApp.complete_titles).
 
     Args:
         prompt_msg: The message shown to the user (e.g., "Enter new movie name: ").
+        completer: Optional callable returning titles that start with a prefix.
 
     Returns:
         The non-empty, stripped title string entered by the user.
     """
-    while True:
-        text = input(Fore.MAGENTA + prompt_msg).strip()
-        if text:
-            return text
-        print(Fore.RED + "⚠️ Title cannot be empty.")
+    with _tab_completion(completer):
+        while True:
+            text = input(Fore.MAGENTA + prompt_msg).strip()
+            if text:
+                return text
+            print(Fore.RED + "⚠️ Title cannot be empty.")
+
+
+@contextmanager
+def _tab_completion(completer: Optional[Callable[[str], List[str]]]):
+    """Install `completer` as the readline Tab completer for the duration of a prompt."""
+    try:
+        import readline
+    except ImportError:  # e.g. Windows without pyreadline
+        readline = None
+    if completer is None or readline is None:
+        yield
+        return
+
+    matches: List[str] = []
+
+    def complete(_text: str, state: int) -> Optional[str]:
+        # Complete the whole line, spaces included, not just the last word.
+        if state == 0:
+            matches[:] = completer(readline.get_line_buffer())
+        return matches[state] if state < len(matches) else None
+
+    previous_completer = readline.get_completer()
+    previous_delims = readline.get_completer_delims()
+    readline.set_completer(complete)
+    readline.set_completer_delims("")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    try:
+        yield
+    finally:
+        readline.set_completer(previous_completer)
+        readline.set_completer_delims(previous_delims)
 
 
 def prompt_rating() -> float:
@@ -60,29 +60,26 @@ def generate_website_from_storage(
 	if not tpl_path.exists():
 		raise FileNotFoundError(f"Template not found: {tpl_path}")
 
-	# 2) Get movies
-	movie_data: Dict[str, Dict[str, Any]] = storage.list_movies()
-
-	# 3) Flatten for rendering
-	movies = [
+	# 2) Stream movies, flattened for rendering
+	movies = (
 		{"title": movie_title, "year": movie.get("year"), "poster": movie.get("poster")}
-		for movie_title, movie in movie_data.items()
-	]
+		for movie_title, movie in storage.iter_movies()
+	)
 
-	# 4) Read template
+	# 3) Read template
 	template_html = tpl_path.read_text(encoding="utf-8")
 
-	# 5) Build grid
+	# 4) Build grid
 	movie_grid_html = build_movie_grid(movies)
 
-	# 6) Fill placeholders
+	# 5) Fill placeholders
 	html_output = (
 		template_html
 		.replace("__TEMPLATE_TITLE__", html.escape(title))
 		.replace("__TEMPLATE_MOVIE_GRID__", movie_grid_html)
 	)
 
-	# 7) Write output
+	# 6) Write output
 	out_path.write_text(html_output, encoding="utf-8")
 
 	# Optional: quick breadcrumb for debugging